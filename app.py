@@ -1,23 +1,53 @@
 # app.py
+import json
 import streamlit as st
 import pandas as pd
 import numpy as np
+import streamlit.components.v1 as components
 from streamlit_folium import st_folium
 
 from modules import (
+    versao_dataset,
     load_csv_data as load_data,
     load_municipios,
     validate_data,
-    filtrar_dados,
-    classificar_propriedades,
-    plot_barras,
-    plot_pizza,
-    compute_stats_df,
     load_municipios,
     preparar_dados as preparar_dados_ctx,
     criar_mapa_contextual,
+    rasterizar_contextual,
     preprocessar_tudo,
     criar_mapa_com_camadas,
+    materializar_metricas,
+    criar_mapa_tiles_vetoriais,
+    url_tiles_lotes,
+    tiles_disponiveis,
+    materializar_piramide,
+    materializar_extensoes,
+    materializar_geometrias,
+    resumo_geometrias,
+    materializar_municipios_lotes,
+    com_municipio_espacial,
+    materializar_reconciliacao,
+    tamanho_camadas,
+    CacheDisco,
+    construir_indice,
+    lote_no_ponto,
+    detalhes_lote,
+    criar_mapa_estado,
+    camada_janela,
+    materializar_grade,
+    materializar_camadas_municipios,
+    criar_mapa_municipio,
+    carregar_sobreposicoes,
+    resumo_sobreposicoes,
+    camada_sobreposicoes,
+    materializar_regioes,
+    camada_regioes,
+    materializar_camadas_regioes,
+    criar_mapa_regioes_cliente,
+    carregar_escopos,
+    conteudo_escopo,
+    conteudo_ao_vivo,
 )
 
 
@@ -33,12 +63,26 @@ load_data = st.cache_data(ttl=3600)(
 # Cacheia validações e splits de dados (poupando re-execuções)
 validate_data = st.cache_data()(validate_data)  # :contentReference[oaicite:4]{index=4}
 
-# Cacheia filtros, classificações e estatísticas
-filtrar_dados = st.cache_data()(filtrar_dados)
-classificar_propriedades = st.cache_data()(classificar_propriedades)
-compute_stats_df = st.cache_data()(
-    compute_stats_df
-)  # :contentReference[oaicite:5]{index=5}
+# Cacheia as geometrias ingeridas nas duas projeções (por versão do dataset)
+materializar_geometrias = st.cache_data()(materializar_geometrias)
+
+# Cacheia a junção espacial lote -> município (por versão do dataset)
+materializar_municipios_lotes = st.cache_data()(materializar_municipios_lotes)
+
+# Cacheia a reconciliação de áreas declaradas x geométricas (por versão do dataset)
+materializar_reconciliacao = st.cache_data()(materializar_reconciliacao)
+
+# Cacheia a tabela de sobreposições entre lotes (por versão do dataset; só
+# leitura: gerada por util/detectar_sobreposicoes.py)
+carregar_sobreposicoes = st.cache_data()(carregar_sobreposicoes)
+
+# Contornos das regiões administrativas (municípios dissolvidos na ingestão)
+materializar_regioes = st.cache_data()(materializar_regioes)
+
+# Gráficos e quadros de todos os escopos, pré-renderizados por versão do dataset
+# (só leitura: se o artefato não existir, o erro não fica em cache)
+carregar_escopos = st.cache_data()(carregar_escopos)
+conteudo_ao_vivo = st.cache_data()(conteudo_ao_vivo)
 
 # Cacheia GeoDataFrame de municípios e preparação de contexto
 load_municipios = st.cache_data()(load_municipios)
@@ -47,6 +91,29 @@ preprocessar_tudo = st.cache_data()(
     preprocessar_tudo
 )  # :contentReference[oaicite:6]{index=6}
 
+# Cacheia a tabela materializada de métricas de concentração (por versão do dataset)
+materializar_metricas = st.cache_data()(materializar_metricas)
+
+# Cacheia a pirâmide de geometrias simplificadas (por versão do dataset e camada).
+# Artefatos só lidos: cache_resource compartilha o objeto em vez de desserializar
+# uma cópia inteira a cada execução
+materializar_piramide = st.cache_resource()(materializar_piramide)
+
+# Cacheia centros e extensões de regiões/municípios (por versão do dataset; só leitura)
+materializar_extensoes = st.cache_resource()(materializar_extensoes)
+
+# Cacheia as camadas de lotes já serializadas por município (por versão do dataset)
+materializar_camadas_municipios = st.cache_data()(materializar_camadas_municipios)
+materializar_camadas_regioes = st.cache_data()(materializar_camadas_regioes)
+
+# Cacheia a grade hexagonal de lotes (por versão do dataset; só leitura)
+materializar_grade = st.cache_resource()(materializar_grade)
+
+# Índice espacial dos lotes: um objeto por versão do dataset, compartilhado entre sessões
+@st.cache_resource
+def indice_lotes(versao, _gdf):
+    return construir_indice(_gdf)
+
 # -----------------------------
 # 🚀 App Streamlit
 # -----------------------------
@@ -69,29 +136,42 @@ def graficos_e_quadros():
             sorted(df_class[col].dropna().unique())
         )
 
-    df_filtrado = filtrar_dados(df_class, opcao, entidade)
-    resultados, total = classificar_propriedades(df_filtrado)
+    no_navegador = st.sidebar.checkbox(
+        "Gráficos no navegador", value=True,
+        help="Envia só as contagens (Vega-Lite) e o navegador desenha; "
+             "desmarcado, os gráficos vêm como imagem do servidor.",
+    )
+
+    # Tudo vem pronto do artefato (util/prerenderizar_graficos.py): nada é renderizado aqui
+    try:
+        conteudo = conteudo_escopo(carregar_escopos(DATA_FOLDER, VERSAO), opcao, entidade)
+    except FileNotFoundError:
+        st.info(
+            "Os gráficos desta versão do dataset ainda não foram pré-renderizados "
+            "(rode util/prerenderizar_graficos.py); exibindo só os gráficos no navegador."
+        )
+        conteudo = conteudo_ao_vivo(df_class, metricas, VERSAO, opcao, entidade)
 
     def preencher_tabs():
-        fig_barra = plot_barras(resultados, f"Propriedades - {opcao} - {entidade}", f"Total: {total}")
-        fig_pizza = plot_pizza(resultados, f"Propriedades - {opcao} - {entidade}", f"Total: {total}")
-            
-        tab1.pyplot(fig_barra)
-        tab2.pyplot(fig_pizza)
+        if no_navegador or conteudo["png_barras"] is None:
+            # theme=None: mantém a paleta CORES em vez do tema do Streamlit
+            for tab, tipo in [(tab1, "barras"), (tab2, "pizza")]:
+                tab.vega_lite_chart(spec=conteudo[f"spec_{tipo}"], width="stretch", theme=None)
+        else:
+            tab1.image(conteudo["png_barras"])
+            tab2.image(conteudo["png_pizza"])
 
         col2.subheader(f"Classificação de Propriedades ({opcao} - {entidade})")
-        col2.table(df_tab)
+        col2.table(conteudo["classificacao"])
 
         col2.subheader("Estatísticas Adicionais")
-        col2.table(compute_stats_df(df_class))
-        fig = plot_pizza(resultados, f"Propriedades - {opcao}", f"Total: {total}")
+        col2.table(conteudo["estatisticas"])
+
+        col2.subheader("Indicadores de Concentração")
+        col2.table(conteudo["concentracao"])
     
-    if resultados:
+    if conteudo is not None:
         st.html('<sapn>Dados atualizadoe em xx/xx/2025</span>')
-        df_tab = pd.DataFrame(
-            list(resultados.items()), columns=["Categoria", "Quantidade"]
-        )
-        df_tab.loc[len(df_tab)] = ["Total", total]
 
         # Tabs
         preencher_tabs()
@@ -100,17 +180,249 @@ def graficos_e_quadros():
         st.warning("Nenhum dado disponível para o filtro selecionado.")
 
 def mapa_contextuall():
-    muni_gdf = load_municipios(DATA_FOLDER)
-    gdf_ctx = preparar_dados_ctx(df_ctx, muni_gdf)
-    mapa = criar_mapa_contextual(gdf_ctx)
-    st_folium(mapa, width=800, height=600)
+    def dados():
+        muni_gdf = load_municipios(DATA_FOLDER)
+        return muni_gdf, preparar_dados_ctx(df_ctx, muni_gdf)
+
+    def construir():
+        muni_gdf, gdf_ctx = dados()
+        piramide_muni = materializar_piramide(
+            muni_gdf.set_index("municipio_norm"), DATA_FOLDER, VERSAO, "municipios", cobertura=True
+        )
+        gdf_regioes = preparar_dados_ctx(df_ctx, regioes.reset_index(), "regiao_administrativa")
+        return criar_mapa_contextual(
+            gdf_ctx, piramide_muni, topojson=True,
+            regioes=gdf_regioes, piramide_regioes=piramide_regioes,
+            progressivo=progressivo, versao=VERSAO,
+        )
+
+    interativo = st.sidebar.checkbox(
+        "Mapa interativo", value=True,
+        help="Desmarque em conexões lentas para ficar só com a imagem estática.",
+    )
+    progressivo = checkbox_progressivo()
+    # Prévia estática primeiro; a camada interativa a substitui quando pronta
+    lugar = st.empty()
+    png = CACHE_MAPAS.obter_ou_gerar(
+        CacheDisco.chave(VERSAO, "raster", "contextual"),
+        lambda: rasterizar_contextual(dados()[1]),
+    )
+    lugar.image(png, caption="Categoria dominante por município")
+    if interativo:
+        with lugar.container():
+            tamanhos = exibir_mapa_cacheado("contextual", progressivo, construir, height=600)
+        mostrar_tamanho_camadas(tamanhos)
+
+def checkbox_progressivo():
+    return st.sidebar.checkbox(
+        "Carregamento progressivo", value=True,
+        help="Mostra primeiro os polígonos simplificados e baixa os detalhados em seguida.",
+    )
 
 def mapa_interativo():
+    troca_no_navegador = st.sidebar.checkbox(
+        "Trocar região no mapa", value=False,
+        help="Carrega todas as regiões de uma vez; a região e as categorias "
+             "são escolhidas no próprio mapa, sem recarregar a página.",
+    )
+    if troca_no_navegador:
+        mapa_regioes_cliente()
+        return
+
     sel_regiao = st.sidebar.selectbox(
-        "Região Administrativa", sorted(df_inter["regiao_administrativa"].unique())
+        "Região Administrativa",
+        ["Todo o Estado"] + sorted(df_inter["regiao_administrativa"].unique())
+    )
+    usar_tiles = st.sidebar.checkbox(
+        "Tiles vetoriais",
+        value=tiles_disponiveis(VERSAO),
+        disabled=not tiles_disponiveis(VERSAO) or sel_regiao == "Todo o Estado",
+        help="Carrega só os lotes da área visível. Gere os tiles com util/gerar_tiles.py.",
     )
-    mapa = criar_mapa_com_camadas(df_inter, sel_regiao)
-    st_folium(mapa, width=800, height=600)
+
+    ver_sobreposicoes = st.sidebar.checkbox(
+        "Sobreposições", value=False,
+        help="Destaca as áreas em que dois lotes se sobrepõem.",
+    )
+
+    mostrar_qualidade_geometrias()
+    extensoes = materializar_extensoes(df_inter, DATA_FOLDER, VERSAO)
+    if sel_regiao == "Todo o Estado":
+        mapa_janela_visivel(extensoes)
+        return
+
+    df_regiao = df_inter[df_inter["regiao_administrativa"] == sel_regiao]
+    sel_municipio = st.sidebar.selectbox(
+        "Município", ["Todos"] + sorted(df_regiao["nome_municipio"].dropna().unique())
+    )
+    if sel_municipio != "Todos":
+        distritos = df_regiao.loc[df_regiao["nome_municipio"] == sel_municipio, "distrito"]
+        sel_distrito = st.sidebar.selectbox(
+            "Distrito", ["Todos"] + sorted(distritos.dropna().unique())
+        )
+        mapa_municipio(
+            extensoes, sel_municipio, None if sel_distrito == "Todos" else sel_distrito,
+            sel_regiao, ver_sobreposicoes,
+        )
+        return
+
+    if usar_tiles:
+        def construir():
+            return criar_mapa_tiles_vetoriais(
+                df_inter, sel_regiao, url_tiles_lotes(VERSAO), extensoes=extensoes
+            )
+        mostrar_tamanho_camadas(
+            exibir_mapa_cacheado("interativo:tiles", sel_regiao, construir, height=820)
+        )
+        return
+
+    # Camadas sem popup por lote: o clique é resolvido no servidor pelo índice espacial.
+    # O st_folium precisa do folium.Map (não do HTML), então só o conteúdo do
+    # mapa vem do cache; a pirâmide só é lida em caso de falta
+    mapa = criar_mapa_com_camadas(
+        df_inter, sel_regiao, lambda: materializar_piramide(df_inter, DATA_FOLDER, VERSAO, "lotes"),
+        extensoes, cache=CACHE_CAMADAS, versao=VERSAO, progressivo=checkbox_progressivo(),
+    )
+    camada_regioes(
+        regioes, 10, piramide_regioes, destaque=sel_regiao, cache=CACHE_CAMADAS, versao=VERSAO
+    ).add_to(mapa)
+    if ver_sobreposicoes:
+        adicionar_sobreposicoes(mapa, "regiao_administrativa", sel_regiao)
+    clique = st_folium(mapa, width=800, height=600, returned_objects=["last_clicked"])
+    mostrar_lote_clicado(clique)
+    mostrar_tamanho_camadas(tamanho_camadas(mapa))
+
+def mapa_regioes_cliente():
+    """Todas as regiões numa só página (HTML em cache); a troca é feita no navegador."""
+    def construir():
+        extensoes = materializar_extensoes(df_inter, DATA_FOLDER, VERSAO)
+        piramide_lotes = materializar_piramide(df_inter, DATA_FOLDER, VERSAO, "lotes")
+        camadas = materializar_camadas_regioes(df_inter, DATA_FOLDER, VERSAO, piramide_lotes)
+        return criar_mapa_regioes_cliente(camadas, extensoes, regioes, piramide_regioes)
+
+    mostrar_qualidade_geometrias()
+    mostrar_tamanho_camadas(
+        exibir_mapa_cacheado("interativo:cliente", None, construir, height=820)
+    )
+
+def mapa_municipio(extensoes, municipio, distrito, regiao, ver_sobreposicoes=False):
+    # só as camadas do município; a pirâmide só é lida se o artefato precisar ser gerado
+    camadas = materializar_camadas_municipios(
+        df_inter, DATA_FOLDER, VERSAO,
+        lambda: materializar_piramide(df_inter, DATA_FOLDER, VERSAO, "lotes"), municipio,
+    )
+    mapa = criar_mapa_municipio(camadas, municipio, extensoes, distrito)
+    camada_regioes(
+        regioes, 12, piramide_regioes, destaque=regiao, cache=CACHE_CAMADAS, versao=VERSAO
+    ).add_to(mapa)
+    if ver_sobreposicoes:
+        adicionar_sobreposicoes(mapa, "nome_municipio", municipio)
+    clique = st_folium(mapa, width=800, height=600, returned_objects=["last_clicked"])
+    mostrar_lote_clicado(clique)
+
+def adicionar_sobreposicoes(mapa, coluna, valor):
+    """Camada de sobreposições do recorte e, na barra lateral, resumo e relatório."""
+    try:
+        sobreposicoes = carregar_sobreposicoes(DATA_FOLDER, VERSAO)
+    except FileNotFoundError:
+        st.sidebar.caption(
+            "Sobreposições ainda não detectadas para esta versão do dataset "
+            "(rode util/detectar_sobreposicoes.py)."
+        )
+        return
+    recorte = sobreposicoes[sobreposicoes[coluna] == valor]
+    if not recorte.empty:
+        camada_sobreposicoes(recorte).add_to(mapa)
+
+    with st.sidebar.expander("Sobreposições", expanded=True):
+        st.caption(f"{len(recorte)} pares de lotes sobrepostos em {valor}")
+        st.dataframe(resumo_sobreposicoes(recorte), hide_index=True)
+        st.download_button(
+            "Baixar relatório de sobreposições (CSV)",
+            sobreposicoes.drop(columns="geometry").to_csv(index=False),
+            file_name=f"sobreposicoes_{VERSAO}.csv",
+            mime="text/csv",
+        )
+
+def mapa_janela_visivel(extensoes):
+    """
+    Estado inteiro, enviando só o conteúdo da janela atual: o mapa base não
+    muda entre execuções e a camada de lotes é trocada pelo st_folium a cada
+    movimento (bounds/zoom da execução anterior ficam no session_state).
+    """
+    anterior = st.session_state.get("mapa_janela") or {}
+    bounds, zoom = anterior.get("bounds"), anterior.get("zoom")
+    limites = None  # primeira execução: o estado inteiro
+    if bounds and bounds.get("_southWest") and zoom is not None:
+        sw, ne = bounds["_southWest"], bounds["_northEast"]
+        limites = [[sw["lat"], sw["lng"]], [ne["lat"], ne["lng"]]]
+    else:
+        zoom = 7
+
+    mapa = criar_mapa_estado(extensoes)
+    camada_regioes(regioes, 7, piramide_regioes, cache=CACHE_CAMADAS, versao=VERSAO).add_to(mapa)
+    piramide_lotes = materializar_piramide(df_inter, DATA_FOLDER, VERSAO, "lotes")
+    grade = materializar_grade(df_inter, DATA_FOLDER, VERSAO)
+    camada = camada_janela(
+        df_inter, indice_lotes(VERSAO, df_inter), limites, zoom, piramide_lotes, grade
+    )
+    saida = st_folium(
+        mapa, key="mapa_janela", width=800, height=600,
+        feature_group_to_add=camada,
+        returned_objects=["bounds", "zoom", "last_clicked"],
+    )
+    mostrar_lote_clicado(saida)
+    mostrar_tamanho_camadas({**tamanho_camadas(mapa), **tamanho_camadas(camada)})
+
+def mostrar_lote_clicado(saida):
+    ponto = (saida or {}).get("last_clicked")
+    if ponto:
+        lote = lote_no_ponto(indice_lotes(VERSAO, df_inter), df_inter, ponto["lat"], ponto["lng"])
+        with st.sidebar.expander("Lote selecionado", expanded=True):
+            if lote is None:
+                st.caption("Nenhum lote no ponto clicado.")
+            else:
+                st.table(detalhes_lote(lote))
+
+def exibir_mapa_cacheado(pagina, selecao, construir, height):
+    """
+    Serve o HTML final do mapa a partir do cache em disco (chave: versão do
+    dataset, página e seleção). Só em caso de falta o mapa é montado com
+    geopandas/folium e renderizado. Devolve o tamanho das camadas embutidas
+    e da página, guardado na mesma entrada do cache que o HTML.
+    """
+    def gerar():
+        mapa = construir()
+        html = mapa.get_root().render().encode()
+        tamanhos = {**tamanho_camadas(mapa), "Página inteira": len(html)}
+        # entrada: tamanhos (JSON) na primeira linha, o HTML em seguida
+        return json.dumps(tamanhos, ensure_ascii=False).encode() + b"\n" + html
+
+    chave = CacheDisco.chave(VERSAO, pagina, selecao, "html+tamanhos")
+    tamanhos, html = CACHE_MAPAS.obter_ou_gerar(chave, gerar).split(b"\n", 1)
+    components.html(html.decode(), height=height)
+    return json.loads(tamanhos)
+
+def mostrar_qualidade_geometrias():
+    with st.sidebar.expander("Qualidade das geometrias"):
+        st.table(resumo_geometrias(geometrias))
+        divergentes = df_inter.loc[municipios_lotes.index[municipios_lotes["municipio_divergente"]]]
+        st.caption(f"{len(divergentes)} lotes fora do município declarado")
+        st.caption(f"{int(reconciliacao['area_divergente'].sum())} lotes com área declarada divergente da geometria")
+        if len(divergentes):
+            st.download_button(
+                "Baixar lotes divergentes (CSV)",
+                divergentes[["nome_municipio", "regiao_administrativa", "area"]]
+                .join(municipios_lotes["municipio_espacial"])
+                .to_csv(),
+                file_name=f"lotes_municipio_divergente_{VERSAO}.csv",
+                mime="text/csv",
+            )
+
+def mostrar_tamanho_camadas(tamanhos):
+    with st.sidebar.expander("Tamanho das camadas"):
+        for nome, n_bytes in tamanhos.items():
+            st.caption(f"{nome}: {n_bytes / 1024:.0f} KB")
 
 
 
@@ -133,8 +445,30 @@ st.markdown("<h1 class='custom-header'>ccTerra::Dashboard Fundiário</h1>", unsa
 
 # Carrega e valida dados
 DATA_FOLDER = "data/"
+VERSAO = versao_dataset(DATA_FOLDER)
+# HTML renderizado dos mapas, compartilhado entre sessões (LRU em disco)
+CACHE_MAPAS = CacheDisco(DATA_FOLDER + "cache/mapas")
+# GeoJSON serializado das camadas de lotes (mapas montados a cada requisição)
+CACHE_CAMADAS = CacheDisco(DATA_FOLDER + "cache/camadas")
 df_raw = load_data(DATA_FOLDER)
-df_all, df_class, df_inter, df_ctx, counts = validate_data(df_raw)
+geometrias = materializar_geometrias(df_raw, DATA_FOLDER, VERSAO)
+df_all, df_class, df_inter, df_ctx, counts = validate_data(df_raw, geometrias)
+# Município de cada lote pela localização (junção espacial); o nome declarado
+# no cadastro só vale para os lotes sem geometria
+municipios_lotes = materializar_municipios_lotes(
+    df_inter, load_municipios(DATA_FOLDER), DATA_FOLDER, VERSAO
+)
+# Áreas/perímetros declarados x geométricos de cada lote
+reconciliacao = materializar_reconciliacao(
+    df_raw, geometrias, load_municipios(DATA_FOLDER), DATA_FOLDER, VERSAO
+)
+# Gráficos, métricas e mapa contextual agrupam os lotes pelo município da junção espacial
+df_class = com_municipio_espacial(df_class, municipios_lotes, load_municipios(DATA_FOLDER))
+df_ctx = com_municipio_espacial(df_ctx, municipios_lotes, load_municipios(DATA_FOLDER))
+# Regiões administrativas: municípios dissolvidos e simplificados por versão
+regioes = materializar_regioes(load_municipios(DATA_FOLDER), df_ctx, DATA_FOLDER, VERSAO)
+piramide_regioes = materializar_piramide(regioes, DATA_FOLDER, VERSAO, "regioes", cobertura=True)
+metricas = materializar_metricas(df_class, DATA_FOLDER, VERSAO)
 
 
 # ---------------------------------------------------
@@ -1,5 +1,6 @@
 from .data_loader import (
     get_latest_dataset,
+    versao_dataset,
     load_csv_data,
     load_municipios,
     validate_data
@@ -9,20 +10,100 @@ from .grafico_interativo import (
     classificar_propriedades,
     plot_barras,
     plot_pizza,
+    renderizar_grafico,
+    grafico_classificacao,
+    spec_barras,
+    spec_pizza,
     compute_stats_df
 )
 from .mapa_contextual import (
     preparar_dados,
-    criar_mapa_contextual
+    criar_mapa_contextual,
+    rasterizar_contextual
 )
 from .mapa_interativo import (
     preprocessar_tudo,
-    criar_mapa_com_camadas
+    criar_mapa_com_camadas,
+    criar_mapa_tiles_vetoriais,
+    detalhes_lote,
+    criar_mapa_estado,
+    camada_janela,
+    criar_mapa_municipio,
+    camada_sobreposicoes,
+    camada_regioes,
+    criar_mapa_regioes_cliente
+)
+from .concentracao import (
+    calcular_metricas,
+    materializar_metricas,
+    metricas_do_escopo
+)
+from .ingestao import (
+    CRS_METRICO,
+    CRS_EXIBICAO,
+    materializar_geometrias,
+    geometrias_metricas,
+    resumo_geometrias,
+    materializar_piramide,
+    materializar_extensoes,
+    materializar_camadas_municipios,
+    materializar_municipios_lotes,
+    com_municipio_espacial,
+    materializar_reconciliacao,
+    materializar_regioes,
+    materializar_camadas_regioes
+)
+from .serializador import (
+    serializar_geojson,
+    serializar_topojson
+)
+from .camadas import tamanho_camadas
+from .cache_disco import CacheDisco
+from .sobreposicoes import (
+    materializar_sobreposicoes,
+    carregar_sobreposicoes,
+    resumo_sobreposicoes
+)
+from .grade import (
+    agregar_em_grade,
+    materializar_grade
+)
+from .indice_espacial import (
+    construir_indice,
+    lote_no_ponto,
+    lotes_na_janela
+)
+from .graficos_escopos import (
+    materializar_escopos,
+    carregar_escopos,
+    conteudo_escopo,
+    conteudo_ao_vivo
+)
+from .tiles_vetoriais import (
+    url_tiles_lotes,
+    tiles_disponiveis
 )
 
 __all__ = [
-    "get_latest_dataset", "load_csv_data", "load_municipios", "validate_data",
+    "get_latest_dataset", "versao_dataset", "load_csv_data", "load_municipios", "validate_data",
     "filtrar_dados", "classificar_propriedades", "plot_barras", "plot_pizza", "compute_stats_df",
+    "renderizar_grafico", "grafico_classificacao", "spec_barras", "spec_pizza",
     "preparar_dados", "criar_choropleth_contextual",
-    "preprocessar_tudo", "criar_mapa_com_camadas"
+    "preprocessar_tudo", "criar_mapa_com_camadas", "criar_mapa_tiles_vetoriais",
+    "calcular_metricas", "materializar_metricas", "metricas_do_escopo",
+    "url_tiles_lotes", "tiles_disponiveis",
+    "CRS_METRICO", "CRS_EXIBICAO", "materializar_geometrias", "geometrias_metricas",
+    "resumo_geometrias",
+    "materializar_piramide", "materializar_extensoes",
+    "serializar_geojson", "serializar_topojson", "tamanho_camadas",
+    "CacheDisco", "construir_indice", "lote_no_ponto", "detalhes_lote",
+    "lotes_na_janela", "criar_mapa_estado", "camada_janela",
+    "agregar_em_grade", "materializar_grade",
+    "materializar_camadas_municipios", "criar_mapa_municipio",
+    "rasterizar_contextual", "materializar_municipios_lotes", "com_municipio_espacial",
+    "materializar_reconciliacao",
+    "materializar_sobreposicoes", "carregar_sobreposicoes", "resumo_sobreposicoes", "camada_sobreposicoes",
+    "materializar_regioes", "camada_regioes",
+    "materializar_camadas_regioes", "criar_mapa_regioes_cliente",
+    "materializar_escopos", "carregar_escopos", "conteudo_escopo", "conteudo_ao_vivo"
 ]
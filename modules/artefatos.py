@@ -0,0 +1,66 @@
+# modules/artefatos.py
+
+"""
+Artefatos derivados do dataset (tabelas materializadas, geometrias
+pré-processadas etc.), gravados em disco e versionados pelo dataset de origem:
+- diretorio_artefatos(base_folder, versao)
+- caminho_artefato(base_folder, versao, nome)
+- carregar_artefato(base_folder, versao, nome, geo, filtros)
+- carregar_ou_materializar(base_folder, versao, nome, construtor, geo, filtros)
+"""
+
+import os
+import pandas as pd
+import geopandas as gpd
+
+_ARTEFATOS_DIR = 'artefatos'
+
+
+def diretorio_artefatos(base_folder: str, versao: str) -> str:
+    """Pasta dos artefatos de uma versão do dataset (criada se não existir)."""
+    path = os.path.join(base_folder, _ARTEFATOS_DIR, versao)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def caminho_artefato(base_folder: str, versao: str, nome: str) -> str:
+    return os.path.join(diretorio_artefatos(base_folder, versao), nome)
+
+
+def _ler(path: str, geo: bool, filtros: list = None) -> pd.DataFrame:
+    return gpd.read_parquet(path, filters=filtros) if geo else pd.read_parquet(path, filters=filtros)
+
+
+def carregar_artefato(
+    base_folder: str, versao: str, nome: str, geo: bool = False, filtros: list = None
+) -> pd.DataFrame:
+    """
+    Lê a tabela `nome` já materializada da versão informada, sem nunca
+    construí-la; FileNotFoundError se ainda não existir. `filtros` (lista
+    de (coluna, operador, valor)) é aplicado na leitura do Parquet.
+    """
+    path = caminho_artefato(base_folder, versao, f"{nome}.parquet")
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return _ler(path, geo, filtros)
+
+
+def carregar_ou_materializar(
+    base_folder: str, versao: str, nome: str, construtor, geo: bool = False, filtros: list = None
+) -> pd.DataFrame:
+    """
+    Lê a tabela `nome` da versão informada; se ainda não existir, chama
+    `construtor()` uma única vez e grava o resultado em Parquet (GeoParquet
+    quando `geo=True`). O índice do DataFrame é preservado. Com `filtros`
+    (como em carregar_artefato), só as linhas pedidas são lidas.
+    """
+    path = caminho_artefato(base_folder, versao, f"{nome}.parquet")
+    if os.path.exists(path):
+        return _ler(path, geo, filtros)
+
+    df = construtor()
+    # grava em arquivo temporário e renomeia, para nunca expor um Parquet pela metade
+    tmp = f"{path}.tmp"
+    df.to_parquet(tmp)
+    os.replace(tmp, path)
+    return _ler(path, geo, filtros) if filtros else df
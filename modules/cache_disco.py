@@ -0,0 +1,84 @@
+# modules/cache_disco.py
+
+"""
+Cache em disco de artefatos renderizados (HTML de mapas, imagens etc.),
+com despejo LRU limitado pelo tamanho total:
+- CacheDisco(diretorio, limite_bytes)
+- CacheDisco.chave(*partes)
+- CacheDisco.obter_ou_gerar(chave, gerar)
+
+Cada entrada é um arquivo; a data de modificação marca o último acesso, de
+modo que o cache sobrevive a reinícios e é compartilhado entre sessões.
+"""
+
+import os
+import hashlib
+
+_LIMITE_PADRAO = 512 * 1024 ** 2  # 512 MB
+
+
+class CacheDisco:
+    def __init__(self, diretorio: str, limite_bytes: int = _LIMITE_PADRAO):
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        os.makedirs(diretorio, exist_ok=True)
+
+    @staticmethod
+    def chave(*partes) -> str:
+        """Chave estável a partir de (versão do dataset, página, seleção, ...)."""
+        return hashlib.sha1("\x1f".join(map(str, partes)).encode()).hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave)
+
+    def obter(self, chave: str):
+        """Bytes da entrada, ou None. Um acerto renova a posição no LRU."""
+        path = self._caminho(chave)
+        try:
+            with open(path, 'rb') as f:
+                dados = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # despejada por outro processo depois da leitura: os bytes já lidos valem
+        return dados
+
+    def guardar(self, chave: str, dados: bytes) -> None:
+        path = self._caminho(chave)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(dados)
+        os.replace(tmp, path)
+        self._despejar()
+
+    def obter_ou_gerar(self, chave: str, gerar) -> bytes:
+        """Devolve a entrada em cache ou chama `gerar()` (que retorna bytes) e guarda."""
+        dados = self.obter(chave)
+        if dados is None:
+            dados = gerar()
+            self.guardar(chave, dados)
+        return dados
+
+    def _despejar(self) -> None:
+        """Remove as entradas menos recentemente usadas até caber no limite."""
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith('.tmp'):
+                continue
+            try:
+                info = os.stat(self._caminho(nome))
+            except FileNotFoundError:  # removida por outro processo
+                continue
+            entradas.append((info.st_mtime, info.st_size, nome))
+
+        total = sum(tam for _, tam, _ in entradas)
+        for _, tam, nome in sorted(entradas):
+            if total <= self.limite_bytes:
+                break
+            try:
+                os.remove(self._caminho(nome))
+            except FileNotFoundError:
+                pass
+            total -= tam
@@ -0,0 +1,342 @@
+# modules/camadas.py
+
+"""
+Elementos folium leves usados pelos mapas:
+- CamadaGeoJson(dados, estilo, nome, tooltip, filtro)
+- CamadaTopoJson(dados, estilo, nome, tooltip)
+- CamadaProgressiva(grosso, url_refino, estilo, nome, tooltip)
+- CamadaRotulos(rotulos, zoom_min, classe)
+- SeletorRegioes(grupos, dados, estilo, limites, inicial, contorno, estilo_contorno)
+- tooltip_campos(campos, aliases)
+- ESCAPAR_HTML (função JavaScript)
+- tamanho_camadas(elemento)
+"""
+
+import html
+import json
+
+from branca.element import MacroElement, Template
+from folium.elements import JSCSSMixin
+from folium.map import Layer
+
+from .serializador import escapar_script
+
+
+class CamadaGeoJson(Layer):
+    """
+    Camada L.geoJson que embute um GeoJSON já serializado (texto, ver
+    modules/serializador.py) tal como está: o folium não relê nem
+    reserializa os dados. `estilo` é uma função JavaScript que recebe a
+    feição e devolve o estilo Leaflet a partir das suas propriedades;
+    `tooltip`, se informado, é uma função JavaScript que devolve o texto
+    do tooltip de cada feição, e `filtro` uma função JavaScript que diz
+    quais feições exibir (o recorte é feito no navegador).
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.geoJson({{ this.dados }}, {
+            style: {{ this.estilo }}
+            {%- if this.tooltip %},
+            onEachFeature: function(feature, layer) {
+                layer.bindTooltip(({{ this.tooltip }})(feature));
+            }
+            {%- endif %}
+            {%- if this.filtro %},
+            filter: {{ this.filtro }}
+            {%- endif %}
+        });
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, dados: str, estilo: str, nome: str = None, tooltip: str = None,
+                 filtro: str = None, overlay: bool = True, control: bool = True, show: bool = True):
+        super().__init__(name=nome, overlay=overlay, control=control, show=show)
+        self._name = "CamadaGeoJson"
+        self.dados = dados
+        self.estilo = estilo
+        self.tooltip = tooltip
+        self.filtro = filtro
+
+
+class CamadaTopoJson(JSCSSMixin, Layer):
+    """
+    Como CamadaGeoJson, para o texto TopoJSON de
+    serializador.serializar_topojson (objeto em 'objects.data'): embutido
+    tal como está e convertido em feições no navegador pelo topojson-client.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = (function(dados) {
+            return L.geoJson(topojson.feature(dados, dados.objects.data), {
+                style: {{ this.estilo }}
+                {%- if this.tooltip %},
+                onEachFeature: function(feature, layer) {
+                    layer.bindTooltip(({{ this.tooltip }})(feature));
+                }
+                {%- endif %}
+            });
+        })({{ this.dados }});
+        {% endmacro %}
+        """
+    )
+
+    # mesma biblioteca usada por folium.TopoJson
+    default_js = [
+        ("topojson", "https://cdnjs.cloudflare.com/ajax/libs/topojson/1.6.9/topojson.min.js"),
+    ]
+
+    def __init__(self, dados: str, estilo: str, nome: str = None, tooltip: str = None,
+                 overlay: bool = True, control: bool = True, show: bool = True):
+        super().__init__(name=nome, overlay=overlay, control=control, show=show)
+        self._name = "CamadaTopoJson"
+        self.dados = dados
+        self.estilo = estilo
+        self.tooltip = tooltip
+
+
+class CamadaProgressiva(Layer):
+    """
+    Camada em duas etapas: `grosso` (GeoJSON em texto, bem simplificado ou
+    agregado) vai embutido na página e aparece na primeira pintura; a
+    versão refinada é baixada de `url_refino` (ver
+    estaticos.publicar_camada) depois que o mapa abre e substitui a grossa
+    quando chega. Se o download falhar, fica a grossa. `estilo` e `tooltip`
+    como em CamadaGeoJson, aplicados às duas versões.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.featureGroup();
+        (function(grupo) {
+            var opcoes = {
+                style: {{ this.estilo }}
+                {%- if this.tooltip %},
+                onEachFeature: function(feature, layer) {
+                    layer.bindTooltip(({{ this.tooltip }})(feature));
+                }
+                {%- endif %}
+            };
+            var grosso = L.geoJson({{ this.grosso }}, opcoes).addTo(grupo);
+            fetch({{ this.url_refino|tojson }})
+                .then(function(r) { if (!r.ok) { throw new Error(r.status); } return r.json(); })
+                .then(function(dados) {
+                    grupo.addLayer(L.geoJson(dados, opcoes));
+                    grupo.removeLayer(grosso);
+                })
+                .catch(function() {});
+        })({{ this.get_name() }});
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, grosso: str, url_refino: str, estilo: str, nome: str = None,
+                 tooltip: str = None, overlay: bool = True, control: bool = True, show: bool = True):
+        super().__init__(name=nome, overlay=overlay, control=control, show=show)
+        self._name = "CamadaProgressiva"
+        self.grosso = grosso
+        self.url_refino = url_refino
+        self.estilo = estilo
+        self.tooltip = tooltip
+
+
+class CamadaRotulos(MacroElement):
+    """
+    Todos os rótulos de texto do mapa numa única camada: `rotulos` é uma
+    lista de (lat, lon, texto), de preferência ancorada em pontos
+    representativos pré-calculados. Os marcadores são criados no navegador
+    a partir de um array compacto, com um estilo CSS único, e a camada só
+    aparece a partir de `zoom_min`.
+    """
+
+    _template = Template(
+        """
+        {% macro header(this, kwargs) %}
+        <style>
+            .{{ this.classe }} {
+                font-size: 6pt; font-weight: bold; color: black;
+                text-shadow: 0 0 4px white; white-space: nowrap;
+            }
+        </style>
+        {% endmacro %}
+
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.layerGroup(
+            {{ this.rotulos }}.map(function(r) {
+                return L.marker([r[0], r[1]], {
+                    icon: L.divIcon({className: "{{ this.classe }}", html: r[2], iconSize: null}),
+                    interactive: false
+                });
+            })
+        );
+        (function(mapa, camada, zoomMin) {
+            function atualizar() {
+                if (mapa.getZoom() >= zoomMin) { mapa.addLayer(camada); }
+                else { mapa.removeLayer(camada); }
+            }
+            mapa.on("zoomend", atualizar);
+            atualizar();
+        })({{ this._parent.get_name() }}, {{ this.get_name() }}, {{ this.zoom_min }});
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, rotulos, zoom_min: int = 0, classe: str = "rotulo-mapa"):
+        super().__init__()
+        self._name = "CamadaRotulos"
+        self.rotulos = json.dumps(
+            [[round(lat, 5), round(lon, 5), html.escape(str(texto))] for lat, lon, texto in rotulos],
+            ensure_ascii=False,
+        )
+        self.zoom_min = zoom_min
+        self.classe = classe
+
+
+class SeletorRegioes(MacroElement):
+    """
+    Troca de região inteiramente no navegador. `dados` é o texto JSON
+    {categoria: {região: FeatureCollection}}, enviado uma única vez;
+    `grupos` mapeia cada categoria ao FeatureGroup do mapa que a exibe (e
+    que o LayerControl liga/desliga). Ao escolher uma região no seletor do
+    canto do mapa, as camadas da região anterior saem dos grupos e as da
+    nova entram, criadas só na primeira vez; o mapa se ajusta a
+    `limites[região]` ([[sul, oeste], [norte, leste]]). Com `contorno` (a
+    camada das regiões), o traço é refeito por `estilo_contorno(feature,
+    região)`. Nenhuma troca passa pelo servidor.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        (function(mapa) {
+            var dados = {{ this.dados }};
+            var grupos = {
+                {%- for cat, grupo in this.grupos.items() %}
+                {{ cat|tojson }}: {{ grupo.get_name() }}{{ "," if not loop.last }}
+                {%- endfor %}
+            };
+            var limites = {{ this.limites }};
+            var estilo = {{ this.estilo }};
+            {%- if this.contorno %}
+            var contorno = {{ this.contorno.get_name() }};
+            var estiloContorno = {{ this.estilo_contorno }};
+            {%- endif %}
+            var todas = {{ this.todas|tojson }};
+            var criadas = {};
+            var visiveis = [];
+
+            function mostrar(regiao) {
+                visiveis.forEach(function(v) { grupos[v[0]].removeLayer(v[1]); });
+                visiveis = [];
+                Object.keys(grupos).forEach(function(cat) {
+                    var porRegiao = dados[cat] || {};
+                    var nomes = regiao === todas ? Object.keys(porRegiao) : [regiao];
+                    nomes.forEach(function(nome) {
+                        if (!porRegiao[nome]) { return; }
+                        var chave = cat + "|" + nome;
+                        if (!criadas[chave]) { criadas[chave] = L.geoJson(porRegiao[nome], {style: estilo}); }
+                        grupos[cat].addLayer(criadas[chave]);
+                        visiveis.push([cat, criadas[chave]]);
+                    });
+                });
+                var alvo = limites[regiao];
+                if (alvo) { mapa.fitBounds(alvo); }
+                {%- if this.contorno %}
+                contorno.setStyle(function(feature) { return estiloContorno(feature, regiao); });
+                {%- endif %}
+            }
+
+            var controle = L.control({position: "topleft"});
+            controle.onAdd = function() {
+                var div = L.DomUtil.create("div", "leaflet-bar");
+                var seletor = L.DomUtil.create("select", "", div);
+                seletor.style.padding = "4px";
+                Object.keys(limites).forEach(function(nome) {
+                    var opcao = L.DomUtil.create("option", "", seletor);
+                    opcao.value = nome;
+                    opcao.textContent = nome;
+                });
+                seletor.value = {{ this.inicial|tojson }};
+                L.DomEvent.disableClickPropagation(div);
+                L.DomEvent.on(seletor, "change", function() { mostrar(seletor.value); });
+                return div;
+            };
+            controle.addTo(mapa);
+            mostrar({{ this.inicial|tojson }});
+        })({{ this._parent.get_name() }});
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, grupos: dict, dados: str, estilo: str, limites: dict, inicial: str,
+                 contorno=None, estilo_contorno: str = None, todas: str = "Todas as regiões"):
+        super().__init__()
+        self._name = "SeletorRegioes"
+        self.grupos = grupos
+        self.dados = dados
+        self.estilo = estilo
+        # `todas` é a opção que mostra todas as regiões; sua entrada em
+        # `limites`, se houver, enquadra o conjunto
+        self.todas = todas
+        self.limites = escapar_script(json.dumps(limites, ensure_ascii=False))
+        self.inicial = inicial
+        self.contorno = contorno
+        self.estilo_contorno = estilo_contorno
+
+
+# Função JavaScript que escapa um valor antes de entrar no HTML de um tooltip
+# ou popup: propriedades vindas dos dados (nomes, distritos, regiões) nunca
+# viram marcação
+ESCAPAR_HTML = """function(v) {
+    return String(v).replace(/[&<>"']/g, function(c) {
+        return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+    });
+}"""
+
+
+def tooltip_campos(campos: list, aliases: list) -> str:
+    """
+    Função JavaScript de tooltip (ver CamadaGeoJson) no formato do
+    folium.GeoJsonTooltip: uma linha "<b>alias:</b> valor" por campo, com
+    os números formatados em pt-BR e os valores escapados (ESCAPAR_HTML).
+    """
+    return """function(feature) {
+    var campos = %s, aliases = %s, esc = %s;
+    return campos.map(function(c, i) {
+        var v = feature.properties[c];
+        if (typeof v === "number") { v = v.toLocaleString("pt-BR"); }
+        return "<b>" + esc(aliases[i]) + ":</b> " + (v === null || v === undefined ? "" : esc(v));
+    }).join("<br>");
+}""" % (
+        escapar_script(json.dumps(campos, ensure_ascii=False)),
+        escapar_script(json.dumps(aliases, ensure_ascii=False)),
+        ESCAPAR_HTML,
+    )
+
+
+# atributos com os dados embutidos na página por cada elemento acima
+_ATRIBUTOS_DADOS = ("dados", "grosso", "rotulos")
+
+
+def tamanho_camadas(elemento) -> dict:
+    """
+    Bytes dos dados que `elemento` (um mapa ou um FeatureGroup) e seus
+    filhos embutem na página, por nome da camada. Mede o texto que vai
+    para o HTML, não o da serialização.
+    """
+    tamanhos = {}
+    for filho in elemento._children.values():
+        for atributo in _ATRIBUTOS_DADOS:
+            texto = getattr(filho, atributo, None)
+            if isinstance(texto, str):
+                nome = getattr(filho, "layer_name", None) or filho._name
+                tamanhos[nome] = tamanhos.get(nome, 0) + len(texto.encode())
+                break
+        for nome, n_bytes in tamanho_camadas(filho).items():
+            tamanhos[nome] = tamanhos.get(nome, 0) + n_bytes
+    return tamanhos
@@ -0,0 +1,205 @@
+# modules/concentracao.py
+
+"""
+Métricas de concentração fundiária calculadas em lote:
+- calcular_metricas(df, niveis, col_area, col_categoria, incluir_estado)
+- materializar_metricas(_df, base_folder, versao)
+- metricas_do_escopo(metricas, scope, entidade)
+- cor_gini(gini, n_lotes)
+- estilo_gini(feature, campo_gini, campo_n)
+
+Gini, Theil T, razão de Palma, participação dos 10%/1% maiores lotes e
+participação da Grande Propriedade saem todos de uma única ordenação de cada
+grupo, numa só passada vetorizada sobre estado, regiões e municípios.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .artefatos import carregar_ou_materializar
+
+# nível -> coluna que define o grupo
+NIVEIS = {
+    'regiao': 'regiao_administrativa',
+    'municipio': 'nome_municipio',
+}
+
+_NOME_TABELA = 'metricas_concentracao'
+
+# Classes de cor do Gini nos mapas: (limite superior, cor)
+CLASSES_GINI = [
+    (0.700, '#f9c0ba'),
+    (0.800, '#d8948c'),
+    (0.850, '#b66960'),
+    (0.900, '#923f37'),
+    (np.inf, '#6e1111'),
+]
+COR_GINI_LOTE_UNICO = '#FFD700'
+COR_GINI_SEM_DADOS  = '#D3D3D3'
+
+
+def _lorenz(p, n, inicio, total, cum0, x):
+    """
+    Curva de Lorenz (linear por partes) de todos os grupos no ponto p:
+    fração da área total detida pelos p*100% menores lotes.
+    """
+    k = p * n
+    j = np.floor(k).astype(np.int64)
+    frac = k - j
+    # índice do próximo lote após os j primeiros (limitado ao fim do grupo)
+    prox = inicio + np.minimum(j, n - 1)
+    acum = cum0[inicio + j] - cum0[inicio] + frac * np.where(j < n, x[prox], 0.0)
+    return acum / total
+
+
+def calcular_metricas(
+    df: pd.DataFrame,
+    niveis: dict = NIVEIS,
+    col_area: str = 'area',
+    col_categoria: str = 'categoria',
+    incluir_estado: bool = True,
+) -> pd.DataFrame:
+    """
+    Calcula as métricas de concentração de área para todos os grupos de
+    todos os níveis de uma vez. Retorna um DataFrame com colunas:
+    ['nivel','entidade','n_lotes','area_total','gini','theil','palma',
+     'top10','top1','part_grande']
+    """
+    validos = df[col_area].notna() & (df[col_area] >= 0)
+    df = df.loc[validos]
+    area = df[col_area].to_numpy(dtype=float)
+    if col_categoria in df.columns:
+        grande = (df[col_categoria] == 'Grande Propriedade').to_numpy()
+    else:
+        grande = np.zeros(len(df), dtype=bool)
+
+    # 1) Empilha os níveis: cada lote entra uma vez por nível, com um código
+    #    de grupo global (estado, regiões e municípios no mesmo vetor)
+    codigos, rotulos = [], []
+    if incluir_estado:
+        codigos.append(np.zeros(len(df), dtype=np.int64))
+        rotulos.append(pd.DataFrame({'nivel': 'estado', 'entidade': ['Ceará']}))
+    for nivel, col in niveis.items():
+        cod, uniques = pd.factorize(df[col])
+        base = sum(len(r) for r in rotulos)
+        codigos.append(np.where(cod >= 0, cod + base, -1))
+        rotulos.append(pd.DataFrame({'nivel': nivel, 'entidade': uniques.astype(object)}))
+
+    g = np.concatenate(codigos)
+    x = np.tile(area, len(codigos))
+    gr = np.tile(grande, len(codigos))
+    manter = g >= 0  # descarta lotes sem município/região naquele nível
+    g, x, gr = g[manter], x[manter], gr[manter]
+    grupos = pd.concat(rotulos, ignore_index=True)
+    n_grupos = len(grupos)
+    if not len(g):
+        # frame ou escopo vazio: sem lotes não há curva de Lorenz (n == 0)
+        return grupos.assign(
+            n_lotes=0, area_total=0.0, gini=np.nan, theil=np.nan, palma=np.nan,
+            top10=np.nan, top1=np.nan, part_grande=np.nan,
+        )
+
+    # 2) Uma única ordenação: por grupo e, dentro do grupo, por área
+    ordem = np.lexsort((x, g))
+    g, x, gr = g[ordem], x[ordem], gr[ordem]
+
+    n = np.bincount(g, minlength=n_grupos)
+    inicio = np.concatenate(([0], np.cumsum(n)[:-1]))
+    rank = np.arange(len(g)) - inicio[g] + 1
+    total = np.bincount(g, weights=x, minlength=n_grupos)
+    cum0 = np.concatenate(([0.0], np.cumsum(x)))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        nf = n.astype(float)
+        total_ok = np.where(total > 0, total, np.nan)
+
+        # Gini: 2·Σ(i·x_i) / (n·Σx) − (n+1)/n
+        gini = 2 * np.bincount(g, weights=rank * x, minlength=n_grupos) / (nf * total_ok) - (nf + 1) / nf
+
+        # Theil T: (1/n)·Σ (x_i/μ)·ln(x_i/μ), com 0·ln 0 = 0
+        s = x / (total_ok / nf)[g]
+        termo = np.where(s > 0, s * np.log(np.where(s > 0, s, 1.0)), 0.0)
+        theil = np.bincount(g, weights=termo, minlength=n_grupos) / nf
+
+        # Participações a partir da curva de Lorenz
+        top10 = 1 - _lorenz(0.90, n, inicio, total_ok, cum0, x)
+        top1 = 1 - _lorenz(0.99, n, inicio, total_ok, cum0, x)
+        palma = top10 / _lorenz(0.40, n, inicio, total_ok, cum0, x)
+
+        part_grande = np.bincount(g, weights=x * gr, minlength=n_grupos) / total_ok
+
+    grupos['n_lotes'] = n
+    grupos['area_total'] = total
+    grupos['gini'] = gini
+    grupos['theil'] = theil
+    grupos['palma'] = np.where(np.isfinite(palma), palma, np.nan)
+    grupos['top10'] = top10
+    grupos['top1'] = top1
+    grupos['part_grande'] = part_grande if col_categoria in df.columns else np.nan
+    return grupos
+
+
+def materializar_metricas(_df: pd.DataFrame, base_folder: str, versao: str) -> pd.DataFrame:
+    """
+    Lê ou grava a tabela de métricas da versão do dataset. O DataFrame não
+    entra na chave de cache do Streamlit: a versão já o identifica.
+    """
+    return carregar_ou_materializar(
+        base_folder, versao, _NOME_TABELA, lambda: calcular_metricas(_df)
+    )
+
+
+def metricas_do_escopo(metricas: pd.DataFrame, scope: str, entidade: str = None) -> pd.DataFrame:
+    """Tabela 'Indicador' x 'Valor' para o escopo selecionado na página de gráficos."""
+    if scope == "Todo o Estado":
+        linha = metricas[metricas['nivel'] == 'estado']
+    elif scope == "Municípios":
+        linha = metricas[(metricas['nivel'] == 'municipio') & (metricas['entidade'] == entidade)]
+    elif scope == "Regiões Administrativas":
+        linha = metricas[(metricas['nivel'] == 'regiao') & (metricas['entidade'] == entidade)]
+    else:
+        raise ValueError(f"Escopo desconhecido: {scope}")
+
+    if linha.empty:
+        return pd.DataFrame(columns=['Indicador', 'Valor'])
+    linha = linha.iloc[0]
+
+    def fmt(valor, formato):
+        # escopo sem lotes válidos: métricas indefinidas (NaN)
+        return '—' if pd.isna(valor) else format(valor, formato)
+
+    return pd.DataFrame({
+        'Indicador': [
+            'Índice de Gini', 'Índice de Theil (T)', 'Razão de Palma',
+            'Área dos 10% maiores lotes', 'Área do 1% maior', 'Área em Grande Propriedade',
+        ],
+        'Valor': [
+            fmt(linha['gini'], '.4f'), fmt(linha['theil'], '.4f'), fmt(linha['palma'], '.2f'),
+            fmt(linha['top10'], '.1%'), fmt(linha['top1'], '.1%'), fmt(linha['part_grande'], '.1%'),
+        ],
+    })
+
+
+def cor_gini(gini: float, n_lotes: float = None) -> str:
+    """Cor da classe do Gini; municípios com um único lote e sem dados à parte."""
+    if n_lotes == 1:
+        return COR_GINI_LOTE_UNICO
+    if pd.isna(gini):
+        return COR_GINI_SEM_DADOS
+    return next(cor for limite, cor in CLASSES_GINI if gini <= limite)
+
+
+def estilo_gini(feature: dict, campo_gini: str = 'gini', campo_n: str = 'n_lotes') -> dict:
+    """
+    Estilo folium/raster do coroplético do Gini. As propriedades variam entre
+    os mapas (p.ex. 'gini_area'/'cnt' na página do Gini): fixe `campo_gini` e
+    `campo_n` com functools.partial, que segue serializável para o pool da
+    exportação.
+    """
+    p = feature['properties']
+    return {
+        'fillColor': cor_gini(p.get(campo_gini), p.get(campo_n)),
+        'color': 'black',
+        'weight': 0.5,
+        'fillOpacity': 0.8,
+    }
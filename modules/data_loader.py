@@ -1,13 +1,16 @@
 # modules/data_loader.py
 
 import os
+import hashlib
 import streamlit as st
 import pandas as pd
 import geopandas as gpd
 import numpy as np
-from shapely import wkt
 import unicodedata
 
+from .artefatos import carregar_ou_materializar
+from .ingestao import CRS_METRICO, CRS_EXIBICAO, geometrias_utilizaveis, ingerir_geometrias
+
 _DATA_PREFIX    = 'dataset-malha-fundiaria-idace_preprocessado-'
 _DATA_SUFFIX    = '.csv'
 _MUNI_GEOJSON   = 'geojson-municipios_ceara-normalizado.geojson'
@@ -21,13 +24,30 @@ def get_latest_dataset(base_folder: str) -> str:
     files.sort()
     return os.path.join(base_folder, files[-1])
 
+
+def versao_dataset(base_folder: str) -> str:
+    """
+    Identificador curto do dataset mais recente (nome, tamanho e data de
+    modificação do CSV e do GeoJSON dos municípios), usado para versionar
+    artefatos e caches: trocar qualquer um dos dois invalida também o que é
+    derivado dos municípios (regiões, junção espacial lote -> município).
+    """
+    partes = []
+    for path in (get_latest_dataset(base_folder), os.path.join(base_folder, _MUNI_GEOJSON)):
+        if os.path.exists(path):
+            info = os.stat(path)
+            partes.append(f"{os.path.basename(path)}:{info.st_size}:{info.st_mtime_ns}")
+    return hashlib.sha1("|".join(partes).encode()).hexdigest()[:12]
+
 @st.cache_data
 def load_csv_data(base_folder: str) -> pd.DataFrame:
     """
     Lê o CSV mais recente, faz as conversões e classifica cada parcela
     em 'categoria', retornando um DataFrame com colunas:
-    ['modulo_fiscal','area','geometry','nome_municipio',
+    ['modulo_fiscal','area','geom','nome_municipio',
      'regiao_administrativa','municipio_norm','categoria']
+    O WKT em 'geom' é convertido uma única vez, na ingestão
+    (ingestao.materializar_geometrias).
     """
     path = get_latest_dataset(base_folder)
     df   = pd.read_csv(path, low_memory=False)
@@ -40,7 +60,6 @@ def load_csv_data(base_folder: str) -> pd.DataFrame:
     df['area']          = df['area'].astype(float)
 
     df = df[df['geom'].notna()].copy()
-    df['geometry'] = df['geom'].apply(wkt.loads)
 
     # normaliza nome do município
     df['municipio_norm'] = df['nome_municipio'].apply(
@@ -62,10 +81,21 @@ def load_csv_data(base_folder: str) -> pd.DataFrame:
 
 
 def load_municipios(base_folder: str) -> gpd.GeoDataFrame:
+    """
+    Municípios já ingeridos (ver _ler_municipios), nas duas projeções:
+    'geometry' em CRS_EXIBICAO e 'geometria_metrica' em CRS_METRICO.
+    """
+    return carregar_ou_materializar(
+        base_folder, versao_dataset(base_folder), 'municipios',
+        lambda: _ler_municipios(base_folder), geo=True
+    )
+
+
+def _ler_municipios(base_folder: str) -> gpd.GeoDataFrame:
     """
     Lê o GeoJSON de municípios, detecta primeiro 'NM_MUN' e, se não achar,
     qualquer coluna que contenha 'nm' e 'mun', renomeia-a para 'nome_municipio'
-    e adiciona muni['municipio_norm'].
+    e adiciona muni['municipio_norm']. Reprojeta uma única vez, na ingestão.
     """
     path = os.path.join(base_folder, _MUNI_GEOJSON)
     muni = gpd.read_file(path)
@@ -85,7 +115,8 @@ def load_municipios(base_folder: str) -> gpd.GeoDataFrame:
                          .encode('ASCII','ignore')
                          .decode().lower()
     )
-    return muni.to_crs(epsg=4326)
+    muni['geometria_metrica'] = muni.geometry.to_crs(CRS_METRICO)
+    return muni.to_crs(CRS_EXIBICAO)
 
 
 # def validate_data(df: pd.DataFrame):
@@ -112,9 +143,10 @@ def load_municipios(base_folder: str) -> gpd.GeoDataFrame:
 #         'descartados':            total - len(df_class)
 #     }
 #     return df, df_class, df_inter, df_ctx, counts
-def validate_data(df: pd.DataFrame):
+def validate_data(df: pd.DataFrame, _geometrias: gpd.GeoDataFrame = None):
     """
-    Recebe DataFrame de load_csv_data e retorna:
+    Recebe DataFrame de load_csv_data e as geometrias da ingestão
+    (ingestao.materializar_geometrias; convertidas na hora se omitidas) e retorna:
       - df_all   : DataFrame completo
       - df_class : DataFrame filtrado para classificação
       - gdf_inter: GeoDataFrame pronto para mapa interativo
@@ -126,14 +158,12 @@ def validate_data(df: pd.DataFrame):
     # 1) Filtra entradas com area e modulo_fiscal
     df_class = df.dropna(subset=['modulo_fiscal', 'area']).copy()
 
-    # 2) Prepara GeoDataFrame para o mapa interativo
-    df_inter = df_class.copy()
-    # Converte WKT → shapely geometry
-    df_inter['geometry'] = df_inter['geom'].apply(lambda w: wkt.loads(w) if pd.notna(w) else None)
-    df_inter = df_inter.dropna(subset=['geometry'])
-    # Monta GeoDataFrame e projeta para WGS84
-    gdf_inter = gpd.GeoDataFrame(df_inter, geometry='geometry', crs='EPSG:31984')
-    gdf_inter = gdf_inter.to_crs(epsg=4326)
+    # 2) Prepara GeoDataFrame para o mapa interativo, com as geometrias já
+    #    ingeridas nas duas projeções (sem reprojetar a cada carga)
+    #    (validadas e reparadas na ingestão; lotes sem geometria utilizável ficam de fora)
+    geometrias = ingerir_geometrias(df_class) if _geometrias is None else _geometrias
+    df_inter = df_class.join(geometrias_utilizaveis(geometrias), how='inner')
+    gdf_inter = gpd.GeoDataFrame(df_inter, geometry='geometry', crs=CRS_EXIBICAO)
 
     # 3) Classifica categorias direto no GeoDataFrame
     conds = [
@@ -153,6 +183,7 @@ def validate_data(df: pd.DataFrame):
         'total_carregados': total,
         'validos_classificacao': len(df_class),
         'validos_mapa_interativo': len(gdf_inter),
+        'geometrias_reparadas': int((gdf_inter['status_geometria'] == 'reparada').sum()),
         'validos_mapa_contextual': len(df_ctx),
         'descartados': total - len(df_class)
     }
@@ -0,0 +1,38 @@
+# modules/estaticos.py
+
+"""
+Camadas publicadas como arquivos estáticos, baixadas pelo navegador depois
+que o mapa abre (ver camadas.CamadaProgressiva):
+- publicar_camada(texto, versao, nome)
+
+Os arquivos ficam em static/camadas/<versao>/ e são servidos pelo próprio
+Streamlit (server.enableStaticServing), como os vector tiles.
+"""
+
+import os
+
+from .cache_disco import CacheDisco
+
+# Pasta servida pelo Streamlit em /app/static/
+_STATIC_DIR = 'static'
+
+
+def diretorio_camadas(versao: str) -> str:
+    return os.path.join(_STATIC_DIR, 'camadas', versao)
+
+
+def publicar_camada(texto: str, versao: str, nome: str) -> str:
+    """
+    Grava o GeoJSON `texto` da camada `nome` (uma vez por versão do
+    dataset) e devolve a URL a partir da raiz do servidor.
+    """
+    arquivo = f"{CacheDisco.chave(nome)}.json"
+    path = os.path.join(diretorio_camadas(versao), arquivo)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # temporário + rename: o navegador nunca baixa um arquivo pela metade
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        os.replace(tmp, path)
+    return f"/app/static/camadas/{versao}/{arquivo}"
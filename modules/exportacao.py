@@ -0,0 +1,78 @@
+# modules/exportacao.py
+
+"""
+Exportação em lote dos mapas estáticos (relatórios), sem navegador:
+- tarefas_exportacao(gdf_inter, gdf_ctx, gdf_gini)
+- exportar_mapas(tarefas, destino, formato, processos)
+
+Cada mapa é desenhado direto das geometrias armazenadas por
+raster.rasterizar_coropletico, com os mesmos estilos dos mapas interativos,
+e as tarefas são distribuídas num pool de processos.
+"""
+
+import os
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import geopandas as gpd
+
+from .concentracao import estilo_gini
+from .mapa_contextual import CAMPOS_ESTILO_CONTEXTUAL, estilo_contextual
+from .mapa_interativo import estilo_lote
+from .raster import rasterizar_coropletico
+
+# Largura (px) das imagens: coropléticos do estado e mapas de lotes
+_LARGURA_ESTADO = 1200
+_LARGURA_LOTES  = 1000
+
+
+def _slug(nome: str) -> str:
+    s = unicodedata.normalize('NFKD', str(nome)).encode('ASCII', 'ignore').decode()
+    return s.lower().strip().replace(' ', '_').replace('/', '_')
+
+
+def tarefas_exportacao(
+    gdf_inter: gpd.GeoDataFrame,
+    gdf_ctx: gpd.GeoDataFrame = None,
+    gdf_gini: gpd.GeoDataFrame = None
+) -> list:
+    """
+    Lista de (arquivo sem extensão, gdf, estilo, campos, largura): os
+    coropléticos do estado (contextual e Gini, quando informados) e um mapa
+    de lotes por região administrativa e por município.
+    """
+    tarefas = []
+    if gdf_ctx is not None:
+        tarefas.append(('mapa_contextual_ceara', gdf_ctx, estilo_contextual,
+                        CAMPOS_ESTILO_CONTEXTUAL, _LARGURA_ESTADO))
+    if gdf_gini is not None:
+        tarefas.append(('mapa_gini_ceara', gdf_gini, estilo_gini,
+                        ['gini', 'n_lotes'], _LARGURA_ESTADO))
+
+    lotes = gdf_inter[['regiao_administrativa', 'nome_municipio', 'categoria', 'geometry']]
+    for pasta, col in [('regioes', 'regiao_administrativa'), ('municipios', 'nome_municipio')]:
+        for nome, sub in lotes.groupby(col):
+            tarefas.append((os.path.join(pasta, _slug(nome)), sub, estilo_lote,
+                            ['categoria'], _LARGURA_LOTES))
+    return tarefas
+
+
+def _exportar(tarefa, destino: str, formato: str) -> str:
+    arquivo, gdf, estilo, campos, largura = tarefa
+    path = os.path.join(destino, f"{arquivo}.{formato}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(rasterizar_coropletico(gdf, estilo, campos, largura, formato))
+    return path
+
+
+def exportar_mapas(tarefas: list, destino: str, formato: str = 'png', processos: int = None) -> list:
+    """
+    Renderiza as `tarefas` (ver tarefas_exportacao) em `destino`, em paralelo.
+    Retorna os caminhos gravados, na ordem das tarefas.
+    """
+    if formato not in ('png', 'svg'):
+        raise ValueError(f"Formato não suportado: {formato}")
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        futuros = [pool.submit(_exportar, t, destino, formato) for t in tarefas]
+        return [f.result() for f in futuros]
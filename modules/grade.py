@@ -0,0 +1,110 @@
+# modules/grade.py
+
+"""
+Agregação dos lotes em grade hexagonal, para a visão do estado inteiro:
+- agregar_em_grade(gdf, tamanho_m)
+- construir_grade(gdf)
+- materializar_grade(_gdf, base_folder, versao)
+- tamanho_para_zoom(zoom)
+
+Cada lote entra na célula do seu centroide (CRS métrico); por célula são
+calculados a contagem, a área total e a categoria dominante, tudo com
+binning vetorizado em NumPy.
+"""
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+from .artefatos import carregar_ou_materializar
+from .ingestao import CRS_METRICO, CRS_EXIBICAO, geometrias_metricas
+
+# zoom -> raio (centro ao vértice) do hexágono, em metros
+TAMANHOS_M = {7: 10000.0, 8: 5000.0, 9: 2500.0, 10: 1250.0}
+
+_RAIZ3 = np.sqrt(3.0)
+
+
+def tamanho_para_zoom(zoom: int) -> float:
+    """Raio da grade adequado ao zoom (o mais fino para zooms acima da tabela)."""
+    zooms = sorted(TAMANHOS_M)
+    zoom = min(max(zoom, zooms[0]), zooms[-1])
+    return TAMANHOS_M[zoom]
+
+
+def _celulas(x: np.ndarray, y: np.ndarray, tamanho: float):
+    """Coordenadas axiais (q, r) do hexágono (vértice para cima) de cada ponto."""
+    qf = (_RAIZ3 / 3 * x - y / 3) / tamanho
+    rf = (2 / 3 * y) / tamanho
+
+    # arredondamento em coordenadas cúbicas (q + r + s = 0)
+    sf = -qf - rf
+    q, r, s = np.round(qf), np.round(rf), np.round(sf)
+    dq, dr, ds = np.abs(q - qf), np.abs(r - rf), np.abs(s - sf)
+    corrige_q = (dq > dr) & (dq > ds)
+    corrige_r = ~corrige_q & (dr > ds)
+    q = np.where(corrige_q, -r - s, q)
+    r = np.where(corrige_r, -q - s, r)
+    return q.astype(np.int64), r.astype(np.int64)
+
+
+def _hexagonos(q: np.ndarray, r: np.ndarray, tamanho: float) -> np.ndarray:
+    """Polígonos (CRS métrico) das células (q, r)."""
+    cx = tamanho * (_RAIZ3 * q + _RAIZ3 / 2 * r)
+    cy = tamanho * 1.5 * r
+    ang = np.radians(30 + 60 * np.arange(7))  # anel fechado
+    xs = cx[:, None] + tamanho * np.cos(ang)[None, :]
+    ys = cy[:, None] + tamanho * np.sin(ang)[None, :]
+    return shapely.polygons(np.stack([xs, ys], axis=-1))
+
+
+def agregar_em_grade(gdf: gpd.GeoDataFrame, tamanho_m: float) -> gpd.GeoDataFrame:
+    """
+    Uma linha por célula ocupada, com colunas ['n', 'area_total',
+    'dominante', 'geometry'] (geometria em CRS_EXIBICAO).
+    """
+    cent = shapely.centroid(geometrias_metricas(gdf))
+    q, r = _celulas(shapely.get_x(cent), shapely.get_y(cent), tamanho_m)
+
+    # 1) Índice denso da célula de cada lote
+    chaves, celula = np.unique(np.stack([q, r], axis=1), axis=0, return_inverse=True)
+    celula = celula.ravel()
+    n_cel = len(chaves)
+
+    # 2) Contagem e área por célula
+    n = np.bincount(celula, minlength=n_cel)
+    area = np.bincount(celula, weights=gdf['area'].fillna(0).to_numpy(float), minlength=n_cel)
+
+    # 3) Categoria dominante: contagem (célula x categoria) e argmax por linha
+    codigos, categorias = pd.factorize(gdf['categoria'])
+    n_cat = len(categorias)
+    validos = codigos >= 0
+    tabela = np.bincount(
+        celula[validos] * n_cat + codigos[validos], minlength=n_cel * n_cat
+    ).reshape(n_cel, n_cat)
+    dominante = np.asarray(categorias)[tabela.argmax(axis=1)]
+
+    hexagonos = gpd.GeoSeries(_hexagonos(chaves[:, 0], chaves[:, 1], tamanho_m), crs=CRS_METRICO)
+    return gpd.GeoDataFrame(
+        {'n': n, 'area_total': area, 'dominante': dominante},
+        geometry=hexagonos.to_crs(CRS_EXIBICAO).values,
+        crs=CRS_EXIBICAO,
+    )
+
+
+def construir_grade(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Grade em todas as resoluções de TAMANHOS_M, identificadas pela coluna 'tamanho'."""
+    partes = []
+    for tamanho in sorted(set(TAMANHOS_M.values())):
+        g = agregar_em_grade(gdf, tamanho)
+        g.insert(0, 'tamanho', tamanho)
+        partes.append(g)
+    return gpd.GeoDataFrame(pd.concat(partes, ignore_index=True), crs=CRS_EXIBICAO)
+
+
+def materializar_grade(_gdf: gpd.GeoDataFrame, base_folder: str, versao: str) -> gpd.GeoDataFrame:
+    """Lê ou grava a grade de lotes (todas as resoluções) da versão do dataset."""
+    return carregar_ou_materializar(
+        base_folder, versao, 'grade_lotes', lambda: construir_grade(_gdf), geo=True
+    )
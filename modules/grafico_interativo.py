@@ -6,9 +6,14 @@ Funções para gerar os gráficos de classificação:
 - classificar_propriedades(df_filtrado)
 - plot_barras(resultados, titulo, subtitulo)
 - plot_pizza(resultados, titulo, subtitulo)
+- renderizar_grafico(fig, formato)
+- grafico_classificacao(tipo, resultados, titulo, subtitulo, formato)
+- spec_barras(resultados, titulo, subtitulo)
+- spec_pizza(resultados, titulo, subtitulo)
 - compute_stats_df(df_class)
 """
 
+import io
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -75,10 +80,10 @@ def plot_barras(resultados, titulo, subtitulo) -> plt.Figure:
         alpha=0.85,
     )
     ax.set_title(f"{titulo}\n{subtitulo}", fontsize=16)
-    plt.xlabel("Categoria", fontsize=14)
-    plt.ylabel("Número de Propriedades", fontsize=14)
-    plt.grid(axis="y", linestyle="--", alpha=0.7)
-    plt.xticks(rotation=45, fontsize=12)
+    ax.set_xlabel("Categoria", fontsize=14)
+    ax.set_ylabel("Número de Propriedades", fontsize=14)
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+    ax.tick_params(axis="x", labelrotation=45, labelsize=12)
 
     for bar in bars:
         height = bar.get_height()
@@ -90,7 +95,7 @@ def plot_barras(resultados, titulo, subtitulo) -> plt.Figure:
             ha="center",
             va="bottom",
         )
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
@@ -130,10 +135,120 @@ def plot_pizza(resultados, titulo, subtitulo) -> plt.Figure:
         loc="center left",
         bbox_to_anchor=(1, 0, 0.5, 1),
     )
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
+def renderizar_grafico(fig: plt.Figure, formato: str = "png") -> bytes:
+    """
+    Serializa a figura em `formato` ('png' ou 'svg') e a fecha em seguida,
+    para que nenhuma figura fique aberta no pyplot entre execuções. O cache
+    dos bytes fica a cargo de quem chama (ver CacheDisco).
+    """
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format=formato, bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+# tipo de gráfico -> função que monta a figura
+_GRAFICOS = {"barras": plot_barras, "pizza": plot_pizza}
+
+
+def grafico_classificacao(tipo: str, resultados, titulo, subtitulo, formato: str = "png") -> bytes:
+    """Gráfico `tipo` ('barras' ou 'pizza') já renderizado em bytes (ver renderizar_grafico)."""
+    return renderizar_grafico(_GRAFICOS[tipo](resultados, titulo, subtitulo), formato)
+
+
+# ————————————————————————————————————————————————————————————————————
+# Especificações Vega-Lite: o navegador desenha o gráfico a partir das
+# contagens agregadas, sem matplotlib no servidor. Cores e ordem das
+# categorias seguem CORES, como nos gráficos renderizados.
+def _valores(resultados) -> tuple:
+    ordem = [cat for cat in CORES if cat in resultados]
+    total = sum(resultados.values())
+    valores = [
+        {
+            "categoria": cat,
+            "quantidade": int(resultados[cat]),
+            "percentual": resultados[cat] / total if total else 0.0,
+            "ordem": i,
+        }
+        for i, cat in enumerate(ordem)
+    ]
+    return ordem, valores
+
+
+def _cor(ordem: list, legenda) -> dict:
+    return {
+        "field": "categoria",
+        "type": "nominal",
+        "scale": {"domain": ordem, "range": [CORES[cat] for cat in ordem]},
+        "legend": legenda,
+    }
+
+
+_TOOLTIP_SPEC = [
+    {"field": "categoria", "title": "Categoria"},
+    {"field": "quantidade", "title": "Quantidade", "format": ","},
+    {"field": "percentual", "title": "Percentual", "format": ".1%"},
+]
+
+
+def spec_barras(resultados, titulo, subtitulo) -> dict:
+    """Equivalente Vega-Lite de plot_barras: barras por categoria com o total acima."""
+    ordem, valores = _valores(resultados)
+    x = {
+        "field": "categoria", "type": "nominal", "sort": ordem,
+        "title": "Categoria", "axis": {"labelAngle": -45},
+    }
+    y = {"field": "quantidade", "type": "quantitative", "title": "Número de Propriedades"}
+    return {
+        "title": {"text": titulo, "subtitle": subtitulo},
+        "data": {"values": valores},
+        "encoding": {"x": x, "y": y},
+        "layer": [
+            {
+                "mark": {"type": "bar", "stroke": "black", "opacity": 0.85},
+                "encoding": {"color": _cor(ordem, None), "tooltip": _TOOLTIP_SPEC},
+            },
+            {
+                "mark": {"type": "text", "baseline": "bottom", "dy": -3},
+                "encoding": {"text": {"field": "quantidade", "type": "quantitative"}},
+            },
+        ],
+    }
+
+
+def spec_pizza(resultados, titulo, subtitulo) -> dict:
+    """Equivalente Vega-Lite de plot_pizza: fatias com percentual e legenda."""
+    ordem, valores = _valores(resultados)
+    theta = {"field": "quantidade", "type": "quantitative", "stack": True}
+    return {
+        "title": {"text": titulo, "subtitle": subtitulo},
+        "data": {"values": valores},
+        "encoding": {
+            "theta": theta,
+            "order": {"field": "ordem", "type": "ordinal"},
+        },
+        "layer": [
+            {
+                "mark": {"type": "arc", "outerRadius": 140},
+                "encoding": {
+                    "color": _cor(ordem, {"title": "Tipos de Propriedade"}),
+                    "tooltip": _TOOLTIP_SPEC,
+                },
+            },
+            {
+                "mark": {"type": "text", "radius": 112},
+                "encoding": {"text": {"field": "percentual", "type": "quantitative", "format": ".1%"}},
+            },
+        ],
+    }
+
+
 def compute_stats_df(df: pd.DataFrame) -> pd.DataFrame:
     stats = df["area"].describe()
     stats = stats.rename(
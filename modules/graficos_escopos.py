@@ -0,0 +1,192 @@
+# modules/graficos_escopos.py
+
+"""
+Pré-renderização, na publicação do dataset, de tudo o que a página
+"Gráficos" exibe em cada escopo (estado, regiões e municípios):
+- escopos(df_class)
+- prerenderizar_escopos(df_class, metricas, processos)
+- materializar_escopos(_df_class, _metricas, base_folder, versao, processos)
+- carregar_escopos(base_folder, versao)
+- conteudo_escopo(conteudos, opcao, entidade)
+- conteudo_ao_vivo(_df_class, _metricas, versao, opcao, entidade)
+
+As contagens por escopo saem do processo principal (são baratas); os PNG
+dos gráficos, que custam o matplotlib, são renderizados num pool de
+processos. O resultado é um artefato da versão do dataset, de modo que a
+página só faz uma consulta e nunca renderiza sob demanda: o app apenas lê o
+artefato (carregar_escopos) e, se ele ainda não existir, calcula na hora só
+as especificações Vega-Lite e as tabelas do escopo pedido (conteudo_ao_vivo),
+sem matplotlib nem pool de processos.
+"""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+
+import pandas as pd
+
+from .artefatos import carregar_artefato, carregar_ou_materializar
+from .concentracao import metricas_do_escopo
+from .grafico_interativo import (
+    classificar_propriedades, compute_stats_df, filtrar_dados,
+    grafico_classificacao, spec_barras, spec_pizza,
+)
+
+# escopo da página -> coluna que define a entidade
+_COLUNAS_ESCOPO = {
+    "Regiões Administrativas": "regiao_administrativa",
+    "Municípios": "nome_municipio",
+}
+
+# opção do estado inteiro: a sua linha guarda também as estatísticas
+# adicionais, que são estaduais e iguais para todos os escopos
+_ESTADO = "Todo o Estado"
+
+# tipos de gráfico e a função da especificação Vega-Lite de cada um
+_SPECS = {"barras": spec_barras, "pizza": spec_pizza}
+
+
+def escopos(df_class: pd.DataFrame) -> list:
+    """Todos os (opção, entidade) selecionáveis na página, estado primeiro."""
+    lista = [(_ESTADO, None)]
+    for opcao, col in _COLUNAS_ESCOPO.items():
+        lista += [(opcao, ent) for ent in sorted(df_class[col].dropna().unique())]
+    return lista
+
+
+def _tabela_json(df: pd.DataFrame) -> str:
+    return df.to_json(orient="split", index=False, force_ascii=False)
+
+
+def _ler_tabela(texto: str) -> pd.DataFrame:
+    # dtype=False: valores já formatados como texto (ex.: '0.4123') continuam texto
+    return pd.read_json(StringIO(texto), orient="split", dtype=False)
+
+
+def _renderizar(tarefa) -> tuple:
+    """PNG de barras e pizza de um escopo (roda nos processos do pool)."""
+    resultados, titulo, subtitulo = tarefa
+    if not resultados:
+        return None, None
+    return tuple(
+        grafico_classificacao(tipo, resultados, titulo, subtitulo) for tipo in _SPECS
+    )
+
+
+def _linha_escopo(
+    df_class: pd.DataFrame, metricas: pd.DataFrame, opcao: str, entidade: str
+) -> tuple:
+    """Linha do artefato de um escopo (sem os PNG) e a tarefa que renderiza os seus PNG."""
+    resultados, total = classificar_propriedades(filtrar_dados(df_class, opcao, entidade))
+    titulo, subtitulo = f"Propriedades - {opcao} - {entidade}", f"Total: {total}"
+
+    linha = {"opcao": opcao, "entidade": entidade, "total": total}
+    if resultados:
+        tabela = pd.DataFrame(list(resultados.items()), columns=["Categoria", "Quantidade"])
+        tabela.loc[len(tabela)] = ["Total", total]
+        linha.update({
+            f"spec_{tipo}": json.dumps(spec(resultados, titulo, subtitulo), ensure_ascii=False)
+            for tipo, spec in _SPECS.items()
+        })
+        linha.update({
+            "tabela_classificacao": _tabela_json(tabela),
+            "tabela_concentracao": _tabela_json(metricas_do_escopo(metricas, opcao, entidade)),
+        })
+    return linha, (resultados, titulo, subtitulo)
+
+
+def prerenderizar_escopos(
+    df_class: pd.DataFrame, metricas: pd.DataFrame, processos: int = None
+) -> pd.DataFrame:
+    """
+    Uma linha por escopo, com colunas ['opcao', 'entidade', 'total',
+    'png_barras', 'png_pizza', 'spec_barras', 'spec_pizza',
+    'tabela_classificacao', 'tabela_estatisticas', 'tabela_concentracao']:
+    os gráficos em PNG e em Vega-Lite (texto JSON) e as tabelas da página
+    (JSON 'split'). As estatísticas adicionais, estaduais, ficam só na
+    linha do estado. Escopos sem dados ficam sem gráficos nem tabelas.
+    """
+    # 1) Contagens e tabelas de cada escopo; as estatísticas, uma única vez
+    linhas, tarefas = [], []
+    for opcao, entidade in escopos(df_class):
+        linha, tarefa = _linha_escopo(df_class, metricas, opcao, entidade)
+        linhas.append(linha)
+        tarefas.append(tarefa)
+    linhas[0]["tabela_estatisticas"] = _tabela_json(compute_stats_df(df_class))
+
+    # 2) PNG dos gráficos em paralelo
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        pngs = list(pool.map(_renderizar, tarefas, chunksize=8))
+
+    tabela = pd.DataFrame(linhas)
+    tabela["png_barras"] = [p[0] for p in pngs]
+    tabela["png_pizza"] = [p[1] for p in pngs]
+    return tabela.reindex(columns=[
+        "opcao", "entidade", "total", "png_barras", "png_pizza", "spec_barras", "spec_pizza",
+        "tabela_classificacao", "tabela_estatisticas", "tabela_concentracao",
+    ])
+
+
+def materializar_escopos(
+    _df_class: pd.DataFrame, _metricas: pd.DataFrame, base_folder: str, versao: str,
+    processos: int = None
+) -> pd.DataFrame:
+    """Lê ou grava o conteúdo pré-renderizado de todos os escopos da versão do dataset."""
+    return carregar_ou_materializar(
+        base_folder, versao, 'graficos_escopos',
+        lambda: prerenderizar_escopos(_df_class, _metricas, processos)
+    )
+
+
+def carregar_escopos(base_folder: str, versao: str) -> pd.DataFrame:
+    """
+    Lê o artefato gerado por util/prerenderizar_graficos.py, sem nunca
+    materializá-lo; FileNotFoundError se ainda não existir.
+    """
+    return carregar_artefato(base_folder, versao, 'graficos_escopos')
+
+
+def _conteudo(linha, estatisticas: str) -> dict:
+    if pd.isna(linha.get("tabela_classificacao")):
+        return None
+    return {
+        "total": int(linha["total"]),
+        "png_barras": linha["png_barras"],
+        "png_pizza": linha["png_pizza"],
+        "spec_barras": json.loads(linha["spec_barras"]),
+        "spec_pizza": json.loads(linha["spec_pizza"]),
+        "classificacao": _ler_tabela(linha["tabela_classificacao"]),
+        "estatisticas": _ler_tabela(estatisticas),
+        "concentracao": _ler_tabela(linha["tabela_concentracao"]),
+    }
+
+
+def conteudo_escopo(conteudos: pd.DataFrame, opcao: str, entidade: str = None) -> dict:
+    """
+    Conteúdo de um escopo pronto para exibir: 'total', 'png_barras',
+    'png_pizza', as especificações 'spec_barras'/'spec_pizza' (dict) e as
+    tabelas 'classificacao', 'estatisticas' e 'concentracao' (DataFrame).
+    None se o escopo não existir ou não tiver dados.
+    """
+    sel = conteudos[conteudos["opcao"] == opcao]
+    if entidade is not None:
+        sel = sel[sel["entidade"] == entidade]
+    if sel.empty:
+        return None
+    estado = conteudos[conteudos["opcao"] == _ESTADO].iloc[0]
+    return _conteudo(sel.iloc[0], estado["tabela_estatisticas"])
+
+
+def conteudo_ao_vivo(
+    _df_class: pd.DataFrame, _metricas: pd.DataFrame, versao: str, opcao: str, entidade: str = None
+) -> dict:
+    """
+    Como conteudo_escopo, calculado na hora para um único escopo quando o
+    artefato da versão ainda não existe: 'png_barras'/'png_pizza' ficam
+    None (só os gráficos Vega-Lite).
+    """
+    linha, _ = _linha_escopo(_df_class, _metricas, opcao, entidade)
+    return _conteudo(
+        {**linha, "png_barras": None, "png_pizza": None},
+        _tabela_json(compute_stats_df(_df_class)),
+    )
@@ -0,0 +1,43 @@
+# modules/indice_espacial.py
+
+"""
+Índice espacial (shapely STRtree) sobre os lotes, para consultas pontuais:
+- construir_indice(gdf)
+- lote_no_ponto(indice, gdf, lat, lon)
+- lotes_na_janela(indice, limites)
+
+O índice é montado uma vez por versão do dataset; a consulta de um clique
+custa microssegundos e dispensa embutir popups por lote no mapa.
+"""
+
+import numpy as np
+import geopandas as gpd
+import shapely
+
+
+def construir_indice(gdf: gpd.GeoDataFrame) -> shapely.STRtree:
+    """STRtree sobre as geometrias de `gdf` (posições = gdf.iloc)."""
+    return shapely.STRtree(np.asarray(gdf.geometry.array))
+
+
+def lote_no_ponto(indice: shapely.STRtree, gdf: gpd.GeoDataFrame, lat: float, lon: float):
+    """
+    Linha de `gdf` do lote que contém o ponto (lat, lon em WGS84), ou None.
+    Havendo sobreposição, devolve o menor lote que contém o ponto.
+    """
+    ids = indice.query(shapely.Point(lon, lat), predicate='intersects')
+    if len(ids) == 0:
+        return None
+    if len(ids) > 1:
+        ids = ids[np.argsort(shapely.area(indice.geometries.take(ids)))]
+    return gdf.iloc[ids[0]]
+
+
+def lotes_na_janela(indice: shapely.STRtree, limites) -> np.ndarray:
+    """
+    Posições (gdf.iloc) dos lotes que tocam a janela
+    [[sul, oeste], [norte, leste]], em ordem crescente.
+    """
+    (sul, oeste), (norte, leste) = limites
+    ids = indice.query(shapely.box(oeste, sul, leste, norte), predicate='intersects')
+    return np.sort(ids)
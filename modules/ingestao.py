@@ -0,0 +1,491 @@
+# modules/ingestao.py
+
+"""
+Etapa de ingestão: tudo o que depende apenas do dataset é calculado uma vez
+por versão e gravado junto com ele (ver modules/artefatos.py):
+- ingerir_geometrias(df)
+- geometrias_utilizaveis(geometrias)
+- resumo_geometrias(geometrias)
+- materializar_geometrias(_df, base_folder, versao)
+- geometrias_metricas(gdf)
+- construir_piramide(gdf, cobertura)
+- materializar_piramide(_gdf, base_folder, versao, camada, cobertura)
+- nivel_para_zoom(zoom)
+- com_nivel(gdf, piramide, zoom, chave)
+- calcular_extensoes(gdf)
+- materializar_extensoes(_gdf, base_folder, versao)
+- enquadramento(extensoes, nivel, entidade)
+- dissolver_regioes(municipios, df)
+- materializar_regioes(_municipios, _df, base_folder, versao)
+- reconciliar_areas(df, geometrias, municipios)
+- materializar_reconciliacao(_df, _geometrias, _municipios, base_folder, versao)
+- associar_municipios(gdf, municipios)
+- materializar_municipios_lotes(_gdf, _municipios, base_folder, versao)
+- com_municipio_espacial(df, municipios_lotes, municipios)
+- particionar_camadas(gdf, chave, propriedades, piramide, zoom)
+- materializar_camadas_municipios(_gdf, base_folder, versao, _piramide, municipio)
+- materializar_camadas_regioes(_gdf, base_folder, versao, _piramide)
+"""
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+from .artefatos import carregar_ou_materializar
+from .serializador import serializar_geojson
+
+# Projeções do projeto, declaradas só aqui:
+# - CRS_METRICO: CRS de origem do WKT do IDACE (SIRGAS 2000 / UTM 24S), usado
+#   para áreas, centroides e simplificação
+# - CRS_EXIBICAO: WGS84, usado pelos mapas
+CRS_METRICO  = 'EPSG:31984'
+CRS_EXIBICAO = 'EPSG:4326'
+
+# Pirâmide de simplificação: nível -> tolerância em metros (nível 0 = original)
+TOLERANCIAS_M = {1: 5.0, 2: 20.0, 3: 80.0, 4: 300.0}
+
+# metros por pixel no zoom 0, na latitude média do Ceará (~5° S)
+_M_POR_PIXEL_Z0 = 156543.03 * np.cos(np.radians(5.0))
+
+
+# Situação da geometria de cada lote após a ingestão
+STATUS_GEOMETRIA = {
+    'valida':       'Válida',
+    'reparada':     'Reparada (make_valid)',
+    'sem_wkt':      'Sem WKT',
+    'wkt_invalido': 'WKT ilegível',
+    'vazia':        'Vazia ou degenerada',
+}
+_UTILIZAVEIS = ['valida', 'reparada']
+
+
+def ingerir_geometrias(df: pd.DataFrame) -> gpd.GeoDataFrame:
+    """
+    Converte a coluna WKT 'geom' (em CRS_METRICO) uma única vez, valida e
+    repara cada geometria (shapely.is_valid / make_valid, vetorizados) e a
+    guarda nas duas projeções: 'geometry' (CRS_EXIBICAO, geometria ativa) e
+    'geometria_metrica' (CRS_METRICO). Mantém o índice de `df` e todas as
+    linhas: 'status_geometria' diz o que houve com cada lote (ver
+    STATUS_GEOMETRIA); as não utilizáveis ficam sem geometria (ver
+    geometrias_utilizaveis).
+    """
+    # 1) Parse do WKT
+    tem_wkt = df['geom'].map(lambda w: isinstance(w, str)).to_numpy()
+    wkt = np.where(tem_wkt, df['geom'].to_numpy(dtype=object), None)
+    geoms = shapely.from_wkt(wkt, on_invalid='ignore')
+    lidas = ~shapely.is_missing(geoms)
+
+    # 2) Validação e reparo, só onde preciso
+    validas = shapely.is_valid(geoms)
+    a_reparar = lidas & ~validas
+    geoms[a_reparar] = shapely.make_valid(
+        geoms[a_reparar], method='structure', keep_collapsed=False
+    )
+    vazias = lidas & (shapely.is_empty(geoms) | (shapely.area(geoms) <= 0))
+
+    # 3) Situação de cada lote
+    status = np.select(
+        [~tem_wkt, ~lidas, vazias, a_reparar],
+        ['sem_wkt', 'wkt_invalido', 'vazia', 'reparada'],
+        default='valida',
+    )
+    geoms[~np.isin(status, _UTILIZAVEIS)] = None
+
+    metrico = gpd.GeoSeries(geoms, index=df.index, crs=CRS_METRICO)
+    return gpd.GeoDataFrame(
+        {'geometria_metrica': metrico, 'status_geometria': status},
+        geometry=metrico.to_crs(CRS_EXIBICAO),
+        crs=CRS_EXIBICAO,
+    )
+
+
+def geometrias_utilizaveis(geometrias: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Só os lotes com geometria válida ou reparada."""
+    return geometrias[geometrias['status_geometria'].isin(_UTILIZAVEIS)]
+
+
+def resumo_geometrias(geometrias: gpd.GeoDataFrame) -> pd.DataFrame:
+    """Relatório da ingestão: quantidade de lotes por situação da geometria."""
+    contagem = geometrias['status_geometria'].value_counts()
+    return pd.DataFrame({
+        'Situação': [STATUS_GEOMETRIA[s] for s in STATUS_GEOMETRIA],
+        'Lotes': [int(contagem.get(s, 0)) for s in STATUS_GEOMETRIA],
+    })
+
+
+def materializar_geometrias(_df: pd.DataFrame, base_folder: str, versao: str) -> gpd.GeoDataFrame:
+    """Lê ou grava as geometrias validadas (nas duas projeções) e a situação de cada lote."""
+    return carregar_ou_materializar(
+        base_folder, versao, 'geometrias_validadas', lambda: ingerir_geometrias(_df), geo=True
+    )
+
+
+def geometrias_metricas(gdf: gpd.GeoDataFrame) -> np.ndarray:
+    """Geometrias em CRS_METRICO: a coluna da ingestão, se houver; senão reprojeta."""
+    if 'geometria_metrica' in gdf.columns:
+        return np.asarray(gdf['geometria_metrica'].array)
+    return np.asarray(gdf.geometry.to_crs(CRS_METRICO).array)
+
+
+def construir_piramide(gdf: gpd.GeoDataFrame, cobertura: bool = False) -> gpd.GeoDataFrame:
+    """
+    Simplifica as geometrias em cada tolerância de TOLERANCIAS_M, preservando
+    a topologia. Com `cobertura=True` (municípios, regiões) as fronteiras
+    compartilhadas são simplificadas juntas, sem abrir frestas entre vizinhos.
+    Retorna um GeoDataFrame com o mesmo índice e uma coluna de geometria em
+    WGS84 por nível ('n1', 'n2', ...).
+    """
+    metrico = geometrias_metricas(gdf)
+
+    niveis = {}
+    for nivel, tol in TOLERANCIAS_M.items():
+        if cobertura and hasattr(shapely, 'coverage_simplify'):
+            simpl = shapely.coverage_simplify(metrico, tol)
+        else:
+            simpl = shapely.simplify(metrico, tol, preserve_topology=True)
+        niveis[f"n{nivel}"] = gpd.GeoSeries(simpl, index=gdf.index, crs=CRS_METRICO).to_crs(CRS_EXIBICAO)
+
+    return gpd.GeoDataFrame(niveis, geometry='n1', crs=CRS_EXIBICAO)
+
+
+def materializar_piramide(
+    _gdf: gpd.GeoDataFrame, base_folder: str, versao: str, camada: str, cobertura: bool = False
+) -> gpd.GeoDataFrame:
+    """Lê ou grava a pirâmide da camada ('lotes', 'municipios', ...) da versão do dataset."""
+    return carregar_ou_materializar(
+        base_folder, versao, f"piramide_{camada}",
+        lambda: construir_piramide(_gdf, cobertura), geo=True
+    )
+
+
+def nivel_para_zoom(zoom: int) -> int:
+    """
+    Maior nível cuja tolerância não passa de um pixel no zoom informado,
+    ou seja, sem perda visível na abertura do mapa.
+    """
+    m_por_pixel = _M_POR_PIXEL_Z0 / 2 ** zoom
+    cabem = [nivel for nivel, tol in TOLERANCIAS_M.items() if tol <= m_por_pixel]
+    return max(cabem, default=0)
+
+
+def com_nivel(gdf: gpd.GeoDataFrame, piramide: gpd.GeoDataFrame, zoom: int, chave: str = None) -> gpd.GeoDataFrame:
+    """
+    Cópia de `gdf` com a geometria trocada pela do nível adequado ao zoom.
+    As linhas são casadas pelo índice ou, se informada, pela coluna `chave`
+    (que deve ser o índice da pirâmide).
+    """
+    nivel = nivel_para_zoom(zoom)
+    if piramide is None or nivel == 0:
+        return gdf
+
+    coluna = piramide[f"n{nivel}"]
+    ids = gdf[chave] if chave else gdf.index
+    out = gdf.copy()
+    out['geometry'] = gpd.GeoSeries(coluna.reindex(ids).values, index=gdf.index, crs=coluna.crs)
+    # mantém a geometria original onde não houver versão simplificada
+    faltando = out.geometry.isna()
+    out.loc[faltando, 'geometry'] = gdf.geometry[faltando]
+    return out
+
+
+# nível -> coluna que define a entidade, para centros e extensões
+_NIVEIS_EXTENSAO = {
+    'regiao': 'regiao_administrativa',
+    'municipio': 'nome_municipio',
+}
+
+
+def calcular_extensoes(gdf: gpd.GeoDataFrame) -> pd.DataFrame:
+    """
+    Centro e bounding box (WGS84) de cada região e município, a partir dos
+    lotes. O centro é a média dos centroides dos lotes ponderada pela área,
+    calculada no CRS métrico; os bounds vêm direto das geometrias em WGS84.
+    Retorna colunas ['nivel','entidade','centro_lat','centro_lon',
+    'minx','miny','maxx','maxy'].
+    """
+    metrico = geometrias_metricas(gdf)
+    cent = shapely.centroid(metrico)
+    area = shapely.area(metrico)
+    b = shapely.bounds(np.asarray(gdf.geometry.array))
+
+    base = pd.DataFrame({
+        'a': area,
+        'ax': area * shapely.get_x(cent),
+        'ay': area * shapely.get_y(cent),
+        'x': shapely.get_x(cent),
+        'y': shapely.get_y(cent),
+        'minx': b[:, 0], 'miny': b[:, 1], 'maxx': b[:, 2], 'maxy': b[:, 3],
+    }, index=gdf.index)
+
+    partes = []
+    for nivel, col in _NIVEIS_EXTENSAO.items():
+        agg = base.groupby(gdf[col].values).agg(
+            a=('a', 'sum'), ax=('ax', 'sum'), ay=('ay', 'sum'),
+            x=('x', 'mean'), y=('y', 'mean'),
+            minx=('minx', 'min'), miny=('miny', 'min'),
+            maxx=('maxx', 'max'), maxy=('maxy', 'max'),
+        )
+        agg.insert(0, 'nivel', nivel)
+        partes.append(agg)
+    ext = pd.concat(partes).rename_axis('entidade').reset_index()
+
+    # média ponderada pela área; sem área (geometrias degeneradas), média simples
+    com_area = ext['a'] > 0
+    cx = np.where(com_area, ext['ax'] / ext['a'].where(com_area, 1), ext['x'])
+    cy = np.where(com_area, ext['ay'] / ext['a'].where(com_area, 1), ext['y'])
+    centros = gpd.GeoSeries(gpd.points_from_xy(cx, cy), crs=CRS_METRICO).to_crs(CRS_EXIBICAO)
+    ext['centro_lat'] = centros.y.values
+    ext['centro_lon'] = centros.x.values
+
+    return ext[['nivel', 'entidade', 'centro_lat', 'centro_lon', 'minx', 'miny', 'maxx', 'maxy']]
+
+
+def materializar_extensoes(_gdf: gpd.GeoDataFrame, base_folder: str, versao: str) -> pd.DataFrame:
+    """Lê ou grava a tabela de centros/extensões da versão do dataset."""
+    return carregar_ou_materializar(
+        base_folder, versao, 'extensoes', lambda: calcular_extensoes(_gdf)
+    )
+
+
+def enquadramento(extensoes: pd.DataFrame, nivel: str, entidade: str):
+    """
+    ([lat, lon] do centro, [[sul, oeste], [norte, leste]]) da entidade,
+    prontos para folium.Map(location=...) e Map.fit_bounds(...).
+    """
+    linha = extensoes[(extensoes['nivel'] == nivel) & (extensoes['entidade'] == entidade)]
+    if linha.empty:
+        raise ValueError(f"Sem extensão pré-calculada para: {entidade}")
+    r = linha.iloc[0]
+    return [r['centro_lat'], r['centro_lon']], [[r['miny'], r['minx']], [r['maxy'], r['maxx']]]
+
+
+def dissolver_regioes(municipios: gpd.GeoDataFrame, df: pd.DataFrame) -> gpd.GeoDataFrame:
+    """
+    Contorno de cada região administrativa, dissolvendo os polígonos dos
+    municípios (data_loader.load_municipios) no CRS métrico. A região de um
+    município é a mais frequente entre os seus lotes ('municipio_norm' x
+    'regiao_administrativa' de `df`); municípios sem lotes ficam de fora.
+    Retorna, indexado por 'regiao_administrativa', ['n_municipios',
+    'geometria_metrica', 'geometry'] (CRS_EXIBICAO), pronto para
+    construir_piramide(..., cobertura=True).
+    """
+    # 1) Região de cada município pelos lotes
+    pares = df[['municipio_norm', 'regiao_administrativa']].dropna()
+    regiao = (
+        pares.groupby(['municipio_norm', 'regiao_administrativa']).size()
+        .sort_values(ascending=False)
+        .reset_index()
+        .drop_duplicates('municipio_norm')
+        .set_index('municipio_norm')['regiao_administrativa']
+    )
+    rotulo = municipios['municipio_norm'].map(regiao)
+    tem_regiao = rotulo.notna().to_numpy()
+
+    # 2) União dos municípios de cada região, uma só vez por versão
+    metrico = geometrias_metricas(municipios)[tem_regiao]
+    nomes = rotulo.to_numpy()[tem_regiao]
+    regioes = np.unique(nomes)
+    uniao = np.array(
+        [shapely.union_all(metrico[nomes == r]) for r in regioes], dtype=object
+    )
+
+    metrica = gpd.GeoSeries(uniao, index=pd.Index(regioes, name='regiao_administrativa'), crs=CRS_METRICO)
+    return gpd.GeoDataFrame(
+        {
+            'n_municipios': pd.Series(nomes).value_counts().reindex(regioes).to_numpy(),
+            'geometria_metrica': metrica,
+        },
+        geometry=metrica.to_crs(CRS_EXIBICAO),
+        crs=CRS_EXIBICAO,
+    )
+
+
+def materializar_regioes(
+    _municipios: gpd.GeoDataFrame, _df: pd.DataFrame, base_folder: str, versao: str
+) -> gpd.GeoDataFrame:
+    """Lê ou grava os contornos das regiões administrativas da versão do dataset."""
+    return carregar_ou_materializar(
+        base_folder, versao, 'regioes', lambda: dissolver_regioes(_municipios, _df), geo=True
+    )
+
+
+# Razão declarado/geométrico acima da qual (ou abaixo do inverso) a área diverge
+TOLERANCIA_AREA = 2.0
+
+
+def _razao(declarado: pd.Series, geometrico: np.ndarray) -> np.ndarray:
+    """declarado / geométrico, NaN onde um dos dois falta ou é zero."""
+    d = pd.to_numeric(declarado, errors='coerce').to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = d / geometrico
+    return np.where((d > 0) & (geometrico > 0), r, np.nan)
+
+
+def reconciliar_areas(
+    df: pd.DataFrame, geometrias: gpd.GeoDataFrame, municipios: gpd.GeoDataFrame = None
+) -> pd.DataFrame:
+    """
+    Compara, numa só passada vetorizada, as áreas (ha) e perímetros (m)
+    declarados ('area', 'area.1', 'perimetro', 'perimetro.1') com os da
+    geometria (ingerir_geometrias, CRS métrico). Com `municipios`
+    (data_loader.load_municipios), também sinaliza lotes maiores que o próprio
+    município (casados por 'municipio_norm'), o que pega erros mesmo sem
+    geometria. Retorna, com o índice de `df`: 'lote_id' (se houver),
+    'area_geom_ha', 'perimetro_geom_m', as razões declarado/geométrico
+    ('razao_area', 'razao_area_1', 'razao_perimetro', 'razao_perimetro_1'),
+    'area_maior_municipio' e 'area_divergente'.
+    """
+    # 1) Área e perímetro geométricos (NaN sem geometria utilizável)
+    metrico = np.asarray(
+        geometrias['geometria_metrica'].reindex(df.index).array, dtype=object
+    )
+    area_geom = shapely.area(metrico) / 10000
+    perim_geom = shapely.length(metrico)
+
+    vazio = pd.Series(np.nan, index=df.index)
+    rec = pd.DataFrame({
+        'area_geom_ha': area_geom,
+        'perimetro_geom_m': perim_geom,
+        'razao_area': _razao(df.get('area', vazio), area_geom),
+        'razao_area_1': _razao(df.get('area.1', vazio), area_geom),
+        'razao_perimetro': _razao(df.get('perimetro', vazio), perim_geom),
+        'razao_perimetro_1': _razao(df.get('perimetro.1', vazio), perim_geom),
+    }, index=df.index)
+    if 'lote_id' in df.columns:
+        rec.insert(0, 'lote_id', df['lote_id'])
+
+    # 2) Área declarada maior que a do município
+    rec['area_maior_municipio'] = False
+    if municipios is not None:
+        area_muni = pd.Series(
+            shapely.area(geometrias_metricas(municipios)) / 10000, index=municipios['municipio_norm']
+        )
+        area_muni = area_muni[~area_muni.index.duplicated()]
+        limite = df['municipio_norm'].map(area_muni).to_numpy(dtype=float)
+        declarada = pd.to_numeric(df['area'], errors='coerce').to_numpy(dtype=float)
+        rec['area_maior_municipio'] = declarada > limite
+
+    # 3) Divergência: razão fora de [1/TOLERANCIA_AREA, TOLERANCIA_AREA] ou lote maior que o município
+    fora = np.abs(np.log(rec['razao_area'])) > np.log(TOLERANCIA_AREA)
+    rec['area_divergente'] = fora.fillna(False).astype(bool) | rec['area_maior_municipio']
+    return rec
+
+
+def materializar_reconciliacao(
+    _df: pd.DataFrame, _geometrias: gpd.GeoDataFrame, _municipios: gpd.GeoDataFrame,
+    base_folder: str, versao: str
+) -> pd.DataFrame:
+    """Lê ou grava a reconciliação de áreas/perímetros da versão do dataset."""
+    return carregar_ou_materializar(
+        base_folder, versao, 'reconciliacao_areas',
+        lambda: reconciliar_areas(_df, _geometrias, _municipios)
+    )
+
+
+def associar_municipios(gdf: gpd.GeoDataFrame, municipios: gpd.GeoDataFrame) -> pd.DataFrame:
+    """
+    Junção espacial lote -> município: o ponto representativo de cada lote
+    (sempre dentro do polígono, ao contrário do centroide) é localizado nos
+    polígonos de `municipios` (data_loader.load_municipios) numa única
+    consulta em lote ao STRtree, no CRS métrico. Retorna, com o índice de
+    `gdf`, as colunas ['municipio_espacial', 'municipio_divergente']: o
+    'municipio_norm' do polígono que contém o lote (NaN se nenhum) e se ele
+    difere do município declarado no cadastro.
+    """
+    pontos = shapely.point_on_surface(geometrias_metricas(gdf))
+    arvore = shapely.STRtree(geometrias_metricas(municipios))
+
+    # pares (lote, município); na divisa entre dois municípios vale o primeiro
+    lote, muni = arvore.query(pontos, predicate='within')
+    lote, primeiro = np.unique(lote, return_index=True)
+    nomes = np.full(len(gdf), None, dtype=object)
+    nomes[lote] = municipios['municipio_norm'].to_numpy()[muni[primeiro]]
+
+    espacial = pd.Series(nomes, index=gdf.index, name='municipio_espacial')
+    divergente = espacial.notna() & (espacial != gdf['municipio_norm'])
+    return pd.DataFrame({'municipio_espacial': espacial, 'municipio_divergente': divergente})
+
+
+def materializar_municipios_lotes(
+    _gdf: gpd.GeoDataFrame, _municipios: gpd.GeoDataFrame, base_folder: str, versao: str
+) -> pd.DataFrame:
+    """Lê ou grava a junção espacial lote -> município da versão do dataset."""
+    return carregar_ou_materializar(
+        base_folder, versao, 'municipios_lotes', lambda: associar_municipios(_gdf, _municipios)
+    )
+
+
+def com_municipio_espacial(
+    df: pd.DataFrame, municipios_lotes: pd.DataFrame, municipios: gpd.GeoDataFrame
+) -> pd.DataFrame:
+    """
+    Cópia de `df` com 'nome_municipio' e 'municipio_norm' trocados pelos do
+    polígono que contém cada lote (materializar_municipios_lotes), para que
+    todas as páginas agrupem os lotes pelo mesmo município. Lotes sem
+    geometria ou fora de todos os polígonos mantêm o município declarado.
+    """
+    espacial = municipios_lotes['municipio_espacial'].reindex(df.index)
+    tem = espacial.notna()
+    nomes = municipios.set_index('municipio_norm')['nome_municipio']
+    out = df.copy()
+    out.loc[tem, 'municipio_norm'] = espacial[tem]
+    out.loc[tem, 'nome_municipio'] = espacial[tem].map(nomes)
+    return out
+
+
+# Camadas de lotes por município, já serializadas: atributos levados ao
+# navegador (estilo + filtro por distrito) e zoom de abertura do município
+PROPRIEDADES_CAMADA_MUNICIPIO = ['categoria', 'distrito']
+ZOOM_MUNICIPIO = 12
+
+# Idem por região, para a troca de região no navegador: só o estilo
+PROPRIEDADES_CAMADA_REGIAO = ['categoria']
+ZOOM_REGIAO = 10
+
+
+def particionar_camadas(
+    gdf: gpd.GeoDataFrame, chave: str, propriedades: list,
+    piramide: gpd.GeoDataFrame = None, zoom: int = ZOOM_MUNICIPIO
+) -> pd.DataFrame:
+    """
+    Um GeoJSON por (entidade de `chave`, categoria), no nível da pirâmide do
+    zoom. Retorna colunas ['entidade', 'categoria', 'geojson'].
+    """
+    gdf = com_nivel(gdf, piramide, zoom)
+    linhas = [
+        (entidade, categoria, serializar_geojson(sub, propriedades))
+        for (entidade, categoria), sub in gdf.groupby([chave, 'categoria'])
+    ]
+    return pd.DataFrame(linhas, columns=['entidade', 'categoria', 'geojson'])
+
+
+def materializar_camadas_municipios(
+    _gdf: gpd.GeoDataFrame, base_folder: str, versao: str, _piramide=None, municipio: str = None
+) -> pd.DataFrame:
+    """
+    Lê ou grava as camadas de lotes particionadas por município, indexadas
+    pelo município. `_piramide` pode ser uma função que a carrega, chamada
+    só se o artefato ainda precisar ser gerado; com `municipio`, só as
+    linhas dele são lidas do Parquet.
+    """
+    def construir():
+        piramide = _piramide() if callable(_piramide) else _piramide
+        return particionar_camadas(
+            _gdf, 'nome_municipio', PROPRIEDADES_CAMADA_MUNICIPIO, piramide
+        ).set_index('entidade')
+
+    filtros = None if municipio is None else [('entidade', '==', municipio)]
+    return carregar_ou_materializar(base_folder, versao, 'camadas_municipios', construir, filtros=filtros)
+
+
+def materializar_camadas_regioes(
+    _gdf: gpd.GeoDataFrame, base_folder: str, versao: str, _piramide: gpd.GeoDataFrame = None
+) -> pd.DataFrame:
+    """Lê ou grava as camadas de lotes particionadas por região, indexadas pela região."""
+    return carregar_ou_materializar(
+        base_folder, versao, 'camadas_regioes',
+        lambda: particionar_camadas(
+            _gdf, 'regiao_administrativa', PROPRIEDADES_CAMADA_REGIAO, _piramide, ZOOM_REGIAO
+        ).set_index('entidade')
+    )
@@ -1,5 +1,6 @@
 # modules/mapa_contextual.py
 
+import json
 import folium
 import geopandas as gpd
 import pandas as pd
@@ -7,6 +8,12 @@ from branca.element import Template, MacroElement
 
 # Cores de dominância
 from public.cores import CORES
+from .camadas import CamadaGeoJson, CamadaProgressiva, CamadaTopoJson, tooltip_campos
+from .estaticos import publicar_camada
+from .ingestao import com_nivel
+from .mapa_interativo import camada_regioes
+from .raster import rasterizar_coropletico
+from .serializador import serializar_geojson, serializar_topojson
 
 cores = CORES
 cores["Sem Registro"] = "#9fa2a5"
@@ -14,13 +21,16 @@ cores["Sem Dados"] = "#cccccc"
 
 
 def preparar_dados(
-    df_ctx: pd.DataFrame, _muni_gdf: gpd.GeoDataFrame
+    df_ctx: pd.DataFrame, _muni_gdf: gpd.GeoDataFrame, chave: str = "municipio_norm"
 ) -> gpd.GeoDataFrame:
     """
     Agrega contagens por município, calcula dominante e proporção de dominância.
+    Com `chave="regiao_administrativa"` e os contornos das regiões
+    (ingestao.materializar_regioes, com o índice resetado) no lugar dos
+    municípios, faz o mesmo por região.
     """
     # 1) Conta por município e categoria
-    tbl = df_ctx.groupby(["municipio_norm", "categoria"]).size().unstack(fill_value=0)
+    tbl = df_ctx.groupby([chave, "categoria"]).size().unstack(fill_value=0)
     # 2) Total e dominante
     tbl["total"] = tbl.sum(axis=1)
     tbl["dominante"] = tbl.drop(columns=["total"]).idxmax(axis=1)
@@ -32,7 +42,7 @@ def preparar_dados(
     tbl = tbl.reset_index()
 
     # 4) Mescla com geometria dos municípios
-    gdf = _muni_gdf.merge(tbl, on="municipio_norm", how="left")
+    gdf = _muni_gdf.merge(tbl, on=chave, how="left")
 
     # 5) Preenche zeros e dados faltantes
     for col in [
@@ -49,41 +59,119 @@ def preparar_dados(
     return gdf.set_geometry("geometry")
 
 
-def criar_mapa_contextual(gdf: gpd.GeoDataFrame) -> folium.Map:
+# Campos do tooltip e, na lista branca da serialização, os usados no estilo
+CAMPOS_TOOLTIP = [
+    'nome_municipio','total','Pequena Propriedade < 1 MF','Pequena Propriedade',
+    'Média Propriedade','Grande Propriedade','dominante'
+]
+ALIASES_TOOLTIP = [
+    'Município','Total de Lotes','Total de Pequena Propriedade < 1 MF',
+    'Total de Pequenas Propriedades','Total de Médias Propriedades',
+    'Total de Grandes Propriedades','Categoria Dominante'
+]
+_CAMPOS_ESTILO = ['prop_dom']
+
+# Tooltip da camada por região
+CAMPOS_TOOLTIP_REGIOES = ['regiao_administrativa'] + CAMPOS_TOOLTIP[1:]
+ALIASES_TOOLTIP_REGIOES = ['Região'] + ALIASES_TOOLTIP[1:]
+
+
+def estilo_contextual(feature):
+    props = feature['properties']
+    cat  = props.get('dominante', 'Sem Dados')
+    prop = props.get('prop_dom', 0)
+    opa  = 0.3 + 0.7 * prop
+    return {
+        'fillColor': cores.get(cat, cores['Sem Dados']),
+        'color': 'black',
+        'weight': 0.4,
+        'fillOpacity': opa,
+    }
+
+
+# Campos lidos por estilo_contextual
+CAMPOS_ESTILO_CONTEXTUAL = ['dominante'] + _CAMPOS_ESTILO
+
+# Equivalentes JavaScript de estilo_contextual e do tooltip, para as camadas
+# que embutem o texto serializado tal como está (ver camadas.CamadaGeoJson)
+_ESTILO_CONTEXTUAL = """function(feature) {
+    var cores = %s;
+    var p = feature.properties;
+    return {
+        fillColor: cores[p.dominante] || cores["Sem Dados"],
+        color: "black",
+        weight: 0.4,
+        fillOpacity: 0.3 + 0.7 * (p.prop_dom || 0)
+    };
+}"""
+
+_TOOLTIP_CONTEXTUAL = tooltip_campos(CAMPOS_TOOLTIP, ALIASES_TOOLTIP)
+_TOOLTIP_CONTEXTUAL_REGIOES = tooltip_campos(CAMPOS_TOOLTIP_REGIOES, ALIASES_TOOLTIP_REGIOES)
+
+
+def rasterizar_contextual(gdf: gpd.GeoDataFrame) -> bytes:
+    """Prévia estática (PNG) do coroplético, com o mesmo estilo do mapa interativo."""
+    return rasterizar_coropletico(gdf, estilo_contextual, CAMPOS_ESTILO_CONTEXTUAL)
+
+
+def criar_mapa_contextual(
+    gdf: gpd.GeoDataFrame,
+    piramide: gpd.GeoDataFrame = None,
+    topojson: bool = False,
+    regioes: gpd.GeoDataFrame = None,
+    piramide_regioes: gpd.GeoDataFrame = None,
+    progressivo: bool = False,
+    versao: str = None
+) -> folium.Map:
+    """
+    Coroplético de categoria dominante por município. Com `piramide`
+    (indexada por 'municipio_norm'), usa os polígonos simplificados para o zoom inicial.
+    A camada é serializada só com os campos do tooltip/estilo; com `topojson=True`
+    as fronteiras compartilhadas entre municípios são enviadas uma única vez.
+    Com `regioes` (preparar_dados por 'regiao_administrativa'), acrescenta o
+    coroplético por região, desligado de início, e o contorno das regiões,
+    simplificados por `piramide_regioes` (indexada pela região).
+    Com `progressivo=True` (exige `versao`), a página leva só os polígonos
+    simplificados e os originais são baixados depois que o mapa abre (ver
+    camadas.CamadaProgressiva).
+    """
     centro = [-5.4984, -39.3200]
-    mapa = folium.Map(location=centro, zoom_start=7)
-
-    # estilo igual antes...
-    def style(feature):
-        props = feature['properties']
-        cat  = props.get('dominante', 'Sem Dados')
-        prop = props.get('prop_dom', 0)
-        opa  = 0.3 + 0.7 * prop
-        return {
-            'fillColor': cores.get(cat, cores['Sem Dados']),
-            'color': 'black',
-            'weight': 0.4,
-            'fillOpacity': opa,
-        }
-
-    folium.GeoJson(
-        gdf,
-        style_function=style,
-        tooltip=folium.features.GeoJsonTooltip(
-            fields=[
-                'nome_municipio','total','Pequena Propriedade < 1 MF','Pequena Propriedade',
-                'Média Propriedade','Grande Propriedade','dominante'
-            ],
-            aliases=[
-                'Município','Total de Lotes','Total de Pequena Propriedade < 1 MF',
-                'Total de Pequenas Propriedades','Total de Médias Propriedades',
-                'Total de Grandes Propriedades','Categoria Dominante'
-            ],
-            localize=True,
-            labels=True,
-            sticky=False
-        )
-    ).add_to(mapa)
+    zoom_start = 7
+    mapa = folium.Map(location=centro, zoom_start=zoom_start)
+    original = gdf
+    gdf = com_nivel(gdf, piramide, zoom_start, chave='municipio_norm')
+
+    estilo = _ESTILO_CONTEXTUAL % json.dumps(cores, ensure_ascii=False)
+    campos = CAMPOS_TOOLTIP + _CAMPOS_ESTILO
+    if progressivo and versao is not None:
+        url = publicar_camada(serializar_geojson(original, campos), versao, 'contextual:original')
+        CamadaProgressiva(
+            serializar_geojson(gdf, campos, nome='contextual'), url, estilo,
+            nome='Municípios', tooltip=_TOOLTIP_CONTEXTUAL
+        ).add_to(mapa)
+    elif topojson:
+        CamadaTopoJson(
+            serializar_topojson(gdf, campos, nome='contextual'), estilo,
+            nome='Municípios', tooltip=_TOOLTIP_CONTEXTUAL
+        ).add_to(mapa)
+    else:
+        CamadaGeoJson(
+            serializar_geojson(gdf, campos, nome='contextual'), estilo,
+            nome='Municípios', tooltip=_TOOLTIP_CONTEXTUAL
+        ).add_to(mapa)
+
+    # Regiões: coroplético opcional e contorno
+    if regioes is not None:
+        regioes = com_nivel(regioes, piramide_regioes, zoom_start, chave='regiao_administrativa')
+        CamadaGeoJson(
+            serializar_geojson(regioes, CAMPOS_TOOLTIP_REGIOES + _CAMPOS_ESTILO, nome='contextual:regioes'),
+            estilo,
+            nome='Regiões (categoria dominante)',
+            tooltip=_TOOLTIP_CONTEXTUAL_REGIOES,
+            show=False
+        ).add_to(mapa)
+        camada_regioes(regioes.set_index('regiao_administrativa'), zoom_start).add_to(mapa)
+        folium.LayerControl(collapsed=True).add_to(mapa)
 
     # monta o template da legenda usando Jinja2
     legenda = """
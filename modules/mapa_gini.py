@@ -1,3 +1,4 @@
+import json
 import streamlit as st
 import pandas as pd
 import geopandas as gpd
@@ -5,11 +6,28 @@ import unicodedata
 import folium
 import numpy as np
 import os
+import sys
+import shapely
 from datetime import datetime
-from folium.features import GeoJsonTooltip
-from shapely.geometry import Polygon, MultiPolygon
+from functools import partial
 from streamlit_folium import st_folium
 
+# permite importar o pacote `modules` quando a página roda isolada
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.cache_disco import CacheDisco
+from modules.camadas import CamadaGeoJson, CamadaRotulos, tooltip_campos
+from modules.concentracao import (
+    CLASSES_GINI, COR_GINI_LOTE_UNICO, COR_GINI_SEM_DADOS, calcular_metricas, estilo_gini,
+)
+from modules.artefatos import carregar_artefato
+from modules.data_loader import load_csv_data, load_municipios, validate_data, versao_dataset
+from modules.ingestao import (
+    com_municipio_espacial, com_nivel, ingerir_geometrias, materializar_geometrias,
+    materializar_municipios_lotes, materializar_piramide, reconciliar_areas,
+)
+from modules.raster import rasterizar_coropletico
+from modules.serializador import serializar_geojson
+
 # ——————————————————————————————————————————————
 # Configurações iniciais
 st.set_page_config(layout="wide")
@@ -26,6 +44,41 @@ def load_data():
     )
     return df, gdf
 
+@st.cache_resource
+def piramide_municipios(_municipios, versao):
+    # gravada com o dataset, como as demais pirâmides; `versao` invalida o cache
+    return materializar_piramide(
+        _municipios.set_index('nome_municipio'), 'data/', versao, 'municipios_gini', cobertura=True
+    )
+
+@st.cache_data
+def ancoras_rotulos(_municipios, versao):
+    # ponto representativo: sempre dentro do polígono, mesmo nos municípios côncavos
+    geoms = np.asarray(_municipios.geometry.array)
+    validos = ~(shapely.is_missing(geoms) | shapely.is_empty(geoms))
+    pontos = shapely.point_on_surface(geoms[validos])
+    nomes = _municipios['nome_municipio'].to_numpy()[validos]
+    return list(zip(shapely.get_y(pontos), shapely.get_x(pontos), nomes))
+
+@st.cache_data
+def reconciliacao(_df, versao):
+    # áreas/perímetros declarados x geométricos e lotes maiores que o próprio município
+    df = _df.assign(municipio_norm=_df['nome_municipio'].map(
+        lambda s: unicodedata.normalize('NFKD', s).encode('ASCII','ignore').decode().lower()
+        if isinstance(s, str) else s
+    ))
+    return reconciliar_areas(df, ingerir_geometrias(df), load_municipios('data/'))
+
+@st.cache_data
+def municipios_lotes(versao):
+    # mesma junção espacial lote -> município do app; só ingere o CSV se o artefato faltar
+    try:
+        return carregar_artefato('data/', versao, 'municipios_lotes')
+    except FileNotFoundError:
+        df_raw = load_csv_data('data/')
+        _, _, gdf_inter, _, _ = validate_data(df_raw, materializar_geometrias(df_raw, 'data/', versao))
+        return materializar_municipios_lotes(gdf_inter, load_municipios('data/'), 'data/', versao)
+
 # Normalização de nomes
 
 def normalizar_nome(nome):
@@ -33,19 +86,12 @@ def normalizar_nome(nome):
     s = unicodedata.normalize('NFKD', nome).encode('ASCII','ignore').decode()
     return s.lower().replace(" ", "_").upper()
 
-# Cálculo de Gini
-
-def gini(arr):
-    a = np.sort(np.array(arr, dtype=float))
-    a = a[a >= 0]
-    n = a.size
-    if n == 0: return float('nan')
-    idx = np.arange(1, n+1)
-    return (2 * np.sum(idx * a) / (n * np.sum(a))) - (n+1)/n
-
 # Carrega dados
 
 df_props, municipios = load_data()
+VERSAO = versao_dataset("data/")
+# agrupa cada lote pelo município que o contém, como os gráficos e o mapa contextual
+df_props = com_municipio_espacial(df_props, municipios_lotes(VERSAO), load_municipios('data/'))
 
 # Detecta outliers via IQR para uso interno
 areas = df_props['area']
@@ -56,10 +102,13 @@ out_iqr = df_props[(areas < Q1 - 1.5*IQR) | (areas > Q3 + 1.5*IQR)]
 # Detecta áreas absurdas: ≥ metade do estado
 # HALF_STATE_HA = 1488860 / 2  # ~744430 ha
 # out_err = df_props[df_props['area'] >= HALF_STATE_HA]
+# e áreas declaradas incompatíveis com a geometria ou maiores que o município
+# (ver ingestao.reconciliar_areas), no lugar de exclusões manuais por lote_id
 HALF_STATE_HA = 1488860 / 2  # ~744430 ha
+rec = reconciliacao(df_props, VERSAO)
 out_err = df_props[
     (df_props['area'] >= HALF_STATE_HA) |
-    (df_props['lote_id'] == 8601)
+    rec['area_divergente']
 ]
 
 # Salva somente áreas absurdas em CSV
@@ -84,14 +133,16 @@ df_with['cnt'] = df_with.groupby('nome_municipio')['area'].transform('count')
 df_no['cnt'] = df_no.groupby('nome_municipio')['area'].transform('count')
 warning_munis = df_with[df_with['cnt'] == 1]['nome_municipio'].unique().tolist()
 
-# Geração DataFrame de Gini por município
+# Geração DataFrame de Gini (e demais métricas de concentração) por município
 def calc_gini_df(df):
-    return df.groupby('nome_municipio').agg(
+    info = df.groupby('nome_municipio').agg(
         nome_municipio_original=('nome_municipio_original','first'),
         regiao_administrativa=('regiao_administrativa','first'),
         cnt=('cnt','first'),
-        gini_area=('area', lambda x: gini(x.values))
-    ).reset_index()
+    )
+    met = calcular_metricas(df, niveis={'municipio': 'nome_municipio'}, incluir_estado=False)
+    met = met.set_index('entidade')[['gini','theil','palma','top10','top1']]
+    return info.join(met.rename(columns={'gini':'gini_area'})).reset_index()
 gini_with = calc_gini_df(df_with)
 gini_no = calc_gini_df(df_no)
 
@@ -100,25 +151,32 @@ gini_with_filt = gini_with[gini_with['cnt'] > 1]
 gini_no_filt   = gini_no[gini_no['cnt'] > 1]
 
 # Cálculo de Gini estadual sem warnings mas incluindo outliers
-state_no_warn = gini(df_with[~df_with['nome_municipio'].isin(warning_munis)]['area'].values)
+state_no_warn = calcular_metricas(
+    df_with[~df_with['nome_municipio'].isin(warning_munis)], niveis={}
+)['gini'].iloc[0]
 
 # Merge GeoJSON + Gini
 geo_with = muni_geo.merge(gini_with, on='nome_municipio', how='left')
 geo_no   = muni_geo.merge(gini_no,   on='nome_municipio', how='left')
 
 # Estilo de polígonos
-def style_fn(f):
-    p = f['properties']
-    if p.get('cnt') == 1:
-        return {'fillColor':'#FFD700','color':'black','weight':0.5,'fillOpacity':0.8}
-    g = p.get('gini_area')
-    if pd.isna(g): return {'fillColor':'#D3D3D3','color':'black','weight':0.5,'fillOpacity':0.8}
-    if g <= 0.700: c='#f9c0ba'
-    elif g <= 0.800: c='#d8948c'
-    elif g <= 0.850: c='#b66960'
-    elif g <= 0.900: c='#923f37'
-    else: c='#6e1111'
-    return {'fillColor':c,'color':'black','weight':0.5,'fillOpacity':0.8}
+style_fn = partial(estilo_gini, campo_gini='gini_area', campo_n='cnt')
+
+# Equivalente JavaScript de style_fn, para a camada embutida como texto
+# (limite infinito da última classe vira null)
+_ESTILO_GINI = """function(feature) {
+    var p = feature.properties, classes = %s, cor;
+    if (p.cnt === 1) { cor = %s; }
+    else if (p.gini_area === null || p.gini_area === undefined) { cor = %s; }
+    else { cor = classes.find(function(c) { return c[0] === null || p.gini_area <= c[0]; })[1]; }
+    return {fillColor: cor, color: "black", weight: 0.5, fillOpacity: 0.8};
+}""" % (
+    json.dumps([[None if np.isinf(lim) else lim, cor] for lim, cor in CLASSES_GINI]),
+    json.dumps(COR_GINI_LOTE_UNICO), json.dumps(COR_GINI_SEM_DADOS),
+)
+_TOOLTIP_GINI = tooltip_campos(
+    ['nome_municipio_original','gini_area','cnt'], ['Município','Índice de Gini','# Lotes']
+)
 
 # Abas
 tabs = st.tabs([
@@ -127,20 +185,29 @@ tabs = st.tabs([
     'Gini do Estado', 'Lotes Excluídos'
 ])
 
+# Pirâmide de geometrias simplificadas dos municípios e âncoras dos rótulos
+piramide_muni = piramide_municipios(muni_geo, VERSAO)
+rotulos_muni = ancoras_rotulos(muni_geo, VERSAO)
+
+# Prévias estáticas (PNG) dos mapas, por versão do dataset e métrica
+CACHE_MAPAS = CacheDisco("data/cache/mapas")
+
 # Renderização de mapas
-def render_map(tab, geo_df):
+def render_map(tab, geo_df, metrica='gini'):
     with tab:
+        # Prévia estática primeiro; o mapa interativo a substitui quando pronto
+        lugar = st.empty()
+        png = CACHE_MAPAS.obter_ou_gerar(
+            CacheDisco.chave(VERSAO, 'raster', metrica),
+            lambda: rasterizar_coropletico(geo_df, style_fn, ['gini_area','cnt']),
+        )
+        lugar.image(png, width=1100)
         m = folium.Map(location=[-5.2,-39.5], zoom_start=8, tiles='cartodbpositron')
-        tooltip = GeoJsonTooltip(fields=['nome_municipio_original','gini_area','cnt'],
-                                 aliases=['Município','Índice de Gini','# Lotes'],
-                                 localize=True, sticky=True)
-        folium.GeoJson(geo_df, style_function=style_fn, tooltip=tooltip).add_to(m)
-        for _, row in geo_df.iterrows():
-            geom = row.geometry
-            if isinstance(geom, (Polygon, MultiPolygon)):
-                c = geom.centroid
-                folium.map.Marker([c.y,c.x], icon=folium.DivIcon(
-                    html=f"""<div style='font-size:6pt; font-weight:bold; color:black; text-shadow:0 0 4px white;'>{row['nome_municipio']}</div>""")).add_to(m)
+        geo_df = com_nivel(geo_df, piramide_muni, 8, chave='nome_municipio')
+        camada = serializar_geojson(geo_df, ['nome_municipio_original','gini_area','cnt'], nome='gini')
+        CamadaGeoJson(camada, _ESTILO_GINI, tooltip=_TOOLTIP_GINI, control=False).add_to(m)
+        # Rótulos dos municípios: uma única camada, visível a partir do zoom inicial
+        m.add_child(CamadaRotulos(rotulos_muni, zoom_min=8, classe='rotulo-municipio'))
         # Adiciona aviso de lotes únicos
         legend_html = """
                 <div style='position:fixed;top:10px;right:10px;background:white;padding:10px;border:1px solid grey;font-size:14px;z-index:9999;'>
@@ -154,7 +221,8 @@ def render_map(tab, geo_df):
                 <i style='background:#D3D3D3;width:12px;height:12px;float:left;margin-right:4px'></i>Sem dados
                 </div>"""
         m.get_root().html.add_child(folium.Element(legend_html))
-        st_folium(m, width=1100, height=900)
+        with lugar.container():
+            st_folium(m, width=1100, height=900)
 
 # Renderiza mapas
 render_map(tabs[0], geo_with)
@@ -163,8 +231,9 @@ render_map(tabs[0], geo_with)
 with tabs[1]:
     st.subheader('Tabela Gini por município')
     st.dataframe(
-        gini_with_filt[['regiao_administrativa','nome_municipio_original','cnt','gini_area']]
-        .rename(columns={'regiao_administrativa':'Região','nome_municipio_original':'Município','cnt':'# Lotes','gini_area':'Gini'}),
+        gini_with_filt[['regiao_administrativa','nome_municipio_original','cnt','gini_area','theil','palma','top10','top1']]
+        .rename(columns={'regiao_administrativa':'Região','nome_municipio_original':'Município','cnt':'# Lotes','gini_area':'Gini',
+                         'theil':'Theil','palma':'Palma','top10':'Área top 10%','top1':'Área top 1%'}),
         use_container_width=True
     )
 
@@ -178,9 +247,12 @@ with tabs[3]:
     st.subheader('Lotes Excluídos')
     out_disp = out_err[['lote_id','nome_municipio_original','regiao_administrativa','area']].copy()
     out_disp['Área'] = out_disp['area'].map(lambda x: str(x).replace('.', ','))
+    out_disp['Área geométrica'] = rec.loc[out_disp.index, 'area_geom_ha'].map(
+        lambda x: '' if pd.isna(x) else f"{x:.2f}".replace('.', ',')
+    )
     st.dataframe(
         out_disp.rename(columns={'lote_id':'Lote ID','nome_municipio_original':'Município','regiao_administrativa':'Região'})
-        [['Lote ID','Município','Região','Área']],
+        [['Lote ID','Município','Região','Área','Área geométrica']],
         use_container_width=True
     )
 
@@ -1,16 +1,35 @@
 """
 Funções para gerar o mapa interativo:
-- preprocessar_tudo(df_inter)
+- preprocessar_tudo(df_inter, geometrias)
 - criar_mapa_com_camadas(gdf_inter, sel_regiao)
+- criar_mapa_tiles_vetoriais(gdf_inter, sel_regiao, url_tiles)
+- detalhes_lote(lote)
+- criar_mapa_municipio(camadas, municipio, extensoes, distrito)
+- camada_sobreposicoes(sobreposicoes)
+- camada_regioes(regioes, zoom, piramide, destaque, cache, versao)
+- criar_mapa_regioes_cliente(camadas, extensoes, regioes, piramide_regioes, inicial)
+- criar_mapa_estado(extensoes)
+- camada_janela(gdf_inter, indice, limites, zoom, piramide, grade)
 """
 
+import json
 import folium
 import pandas as pd
 import geopandas as gpd
 import numpy as np
-from shapely import wkt
-from shapely.ops import unary_union
-from shapely.geometry import Point
+from branca.element import Template, MacroElement
+from folium.plugins import VectorGridProtobuf
+
+from .cache_disco import CacheDisco
+from .camadas import ESCAPAR_HTML, CamadaGeoJson, CamadaProgressiva, SeletorRegioes
+from .estaticos import publicar_camada
+from .grade import agregar_em_grade, tamanho_para_zoom
+from .indice_espacial import lotes_na_janela
+from .ingestao import (
+    CRS_EXIBICAO, ZOOM_MUNICIPIO, ZOOM_REGIAO, com_nivel, enquadramento, geometrias_utilizaveis,
+    ingerir_geometrias, nivel_para_zoom
+)
+from .serializador import escapar_script, serializar_geojson
 
 # ————————————————————————————————————————————————————————————————————
 # Configuração de cores por categoria
@@ -19,6 +38,27 @@ from public.cores import CORES as cores
 CORES = cores
 CORES["Sem Classificação"] = "#808080"
 
+# Atributos exibidos nos detalhes de cada lote (painel do clique / popup dos tiles)
+CAMPOS_DETALHES = [
+    "imovel", "numero_incra", "situacao_juridica", "nome_municipio",
+    "distrito", "area", "categoria",
+]
+ALIASES_DETALHES = [
+    "Nome", "INCRA", "Situação", "Município", "Distrito", "Área (ha)", "Categoria",
+]
+
+# Atributos que vão para o navegador na camada de lotes (só o necessário ao estilo)
+CAMPOS_CAMADA = ["categoria"]
+
+# Modo "janela visível": abaixo deste zoom, ou acima deste número de lotes
+# na janela, o mapa mostra a grade hexagonal (ver modules/grade.py)
+ZOOM_MIN_LOTES = 11
+LIMITE_LOTES_JANELA = 4000
+
+# Modo progressivo: zoom cujo nível da pirâmide (o mais simplificado) vai na
+# primeira pintura
+ZOOM_GROSSO = 7
+
 # ————————————————————————————————————————————————————————————————————
 def carregar_dados_por_regiao(data: pd.DataFrame, regiao: str) -> gpd.GeoDataFrame:
     """Filtra e prepara os dados para a região especificada."""
@@ -32,29 +72,20 @@ def carregar_dados_por_regiao(data: pd.DataFrame, regiao: str) -> gpd.GeoDataFra
     return df
 
 # ————————————————————————————————————————————————————————————————————
-def preprocessar_tudo(df_raw: pd.DataFrame) -> gpd.GeoDataFrame:
+def preprocessar_tudo(df_raw: pd.DataFrame, geometrias: gpd.GeoDataFrame = None) -> gpd.GeoDataFrame:
     """
-    1) Filtra os dados válidos
-    2) Converte WKT para Shapely
-    3) Converte para GeoDataFrame
-    4) Classifica todas as propriedades
-    5) Retorna um GeoDataFrame COMPLETO pronto pra filtrar por região.
+    1) Junta as geometrias da ingestão (WGS84 + métrica, já validadas e
+       reparadas; convertidas do WKT se `geometrias` for omitido)
+    2) Converte para GeoDataFrame
+    3) Classifica todas as propriedades
+    4) Retorna um GeoDataFrame COMPLETO pronto pra filtrar por região.
     """
-    df = df_raw[df_raw['geom'].notna() & df_raw['geom'].apply(lambda x: isinstance(x, str))].copy()
-
-    # converte string WKT em shapely
-    def to_geom(w):
-        try:
-            return wkt.loads(w)
-        except:
-            return None
-
-    df['geometry'] = df['geom'].map(to_geom)
-    df = df[df['geometry'].notna()]
-
-    # monta GeoDataFrame e projeta
-    gdf = gpd.GeoDataFrame(df, geometry='geometry', crs='EPSG:31984')
-    gdf = gdf.to_crs(epsg=4326)
+    if geometrias is None:
+        geometrias = ingerir_geometrias(df_raw)
+    df = df_raw.drop(columns=['geometry'], errors='ignore').join(
+        geometrias_utilizaveis(geometrias), how='inner'
+    )
+    gdf = gpd.GeoDataFrame(df, geometry='geometry', crs=CRS_EXIBICAO)
 
     # Classificação
     conds = [
@@ -136,75 +167,497 @@ def preprocessar_tudo(df_raw: pd.DataFrame) -> gpd.GeoDataFrame:
 #     folium.LayerControl(collapsed=True).add_to(m)
 
 #     return m
-def criar_mapa_com_camadas(gdf: gpd.GeoDataFrame, regiao: str) -> folium.Map:
+def criar_mapa_com_camadas(
+    gdf: gpd.GeoDataFrame,
+    regiao: str,
+    piramide: gpd.GeoDataFrame = None,
+    extensoes: pd.DataFrame = None,
+    cache: CacheDisco = None,
+    versao: str = None,
+    progressivo: bool = False
+) -> folium.Map:
     """
-    Gera um mapa Folium com camadas por categoria para a região especificada,
-    corrigindo geometrias inválidas e usando fallback de bounding box se necessário.
+    Gera um mapa Folium com camadas por categoria para a região especificada.
+    Se `piramide` for informada (ver ingestao.materializar_piramide), os lotes
+    saem no nível de simplificação adequado ao zoom inicial; com `extensoes`
+    (ingestao.materializar_extensoes) o centro e o enquadramento da região vêm
+    pré-calculados, sem reprojeção nem união de geometrias por requisição.
+    As camadas levam só a categoria: os detalhes de um lote são buscados no
+    clique (ver indice_espacial.lote_no_ponto e detalhes_lote). Com `cache`,
+    tudo o que o mapa embute (enquadramento e GeoJSON de cada categoria) é
+    guardado por versão, região e modo, e uma repetição só monta o
+    folium.Map a partir dele, sem geopandas; `piramide` pode então ser uma
+    função que a carrega, chamada só em caso de falta.
+    Com `progressivo=True` (exige `versao`), a página leva só o nível mais
+    simplificado da pirâmide e os lotes no nível de ZOOM_MUNICIPIO são
+    baixados em seguida (ver camadas.CamadaProgressiva).
     """
-    # 1) Projeta para cálculo e remove geometrias vazias
-    gdf_proj = gdf.to_crs(epsg=31983)
-    gdf_proj = gdf_proj[~gdf_proj.geometry.is_empty]
-    if gdf_proj.empty:
-        raise ValueError(f"Sem geometrias válidas para calcular o centro em: {regiao}")
+    zoom_start = 10
+    progressivo = progressivo and versao is not None
 
-    # 2) Tenta corrigir geometrias inválidas e fazer o union
-    try:
-        geoms_fixed = gdf_proj.geometry.apply(
-            lambda g: g.buffer(0) if not g.is_valid else g
+    # 1) Enquadramento e camadas da região, do cache quando disponível
+    def gerar():
+        return _conteudo_regiao(
+            gdf, regiao, piramide() if callable(piramide) else piramide,
+            extensoes, zoom_start, progressivo, versao
         )
-        union_geom = unary_union(geoms_fixed)
-        centro_proj = union_geom.centroid
-    except Exception:
-        # Fallback: usa bounding box
-        xmin, ymin, xmax, ymax = gdf_proj.total_bounds
-        centro_proj = Point((xmin + xmax) / 2, (ymin + ymax) / 2)
-
-    # 3) Transforma o ponto central para WGS84
-    centro_wgs84 = (
-        gpd.GeoSeries([centro_proj], crs="EPSG:31983")
-           .to_crs(epsg=4326)[0]
+
+    if cache is not None:
+        chave = CacheDisco.chave(versao, "mapa_regiao", regiao, progressivo)
+        conteudo = json.loads(cache.obter_ou_gerar(chave, lambda: json.dumps(gerar()).encode()))
+    else:
+        conteudo = gerar()
+
+    # 2) Inicia o mapa centrado e ajusta à extensão da região
+    m = folium.Map(
+        location=conteudo["centro"],
+        zoom_start=zoom_start,
+        width="95%",
+        height="800px"
+    )
+    m.fit_bounds(conteudo["limites"])
+
+    # 3) Uma camada por categoria, com o GeoJSON embutido como texto; no modo
+    #    progressivo, a versão grossa embutida e a refinada baixada depois
+    camadas, urls = conteudo["camadas"], conteudo["urls"]
+    for cat in CORES:
+        if cat in urls:
+            CamadaProgressiva(camadas[cat], urls[cat], _ESTILO_LOTES, nome=cat).add_to(m)
+        elif cat in camadas:
+            CamadaGeoJson(camadas[cat], _ESTILO_LOTES, nome=cat).add_to(m)
+
+    # 4) Adiciona legenda estática
+    _adicionar_legenda(m, regiao)
+
+    # 5) Controla as camadas
+    folium.LayerControl(collapsed=True).add_to(m)
+
+    return m
+
+
+def _conteudo_regiao(gdf, regiao, piramide, extensoes, zoom, progressivo, versao) -> dict:
+    """
+    {'centro', 'limites', 'camadas': {categoria: GeoJSON (texto)}, 'urls':
+    {categoria: URL da versão refinada}} do mapa da região (JSON puro, para
+    o cache em disco); 'urls' só no modo progressivo.
+    """
+    centro, limites = _enquadrar_regiao(gdf, regiao, extensoes)
+    if not progressivo:
+        camadas, urls = _camadas_serializadas(gdf, regiao, piramide, zoom), {}
+    else:
+        camadas = _camadas_serializadas(gdf, regiao, piramide, ZOOM_GROSSO)
+        refinadas = _camadas_serializadas(gdf, regiao, piramide, ZOOM_MUNICIPIO)
+        nivel = nivel_para_zoom(ZOOM_MUNICIPIO)
+        urls = {
+            cat: publicar_camada(texto, versao, f"lotes:{regiao}:{cat}:{nivel}")
+            for cat, texto in refinadas.items() if cat in camadas
+        }
+    return {
+        "centro": [float(c) for c in centro],
+        "limites": [[float(c) for c in canto] for canto in limites],
+        "camadas": camadas,
+        "urls": urls,
+    }
+
+
+def detalhes_lote(lote: pd.Series) -> pd.DataFrame:
+    """Tabela 'Campo' x 'Valor' com os atributos do lote clicado."""
+    valores = [lote.get(c, "") for c in CAMPOS_DETALHES]
+    return pd.DataFrame({
+        "Campo": ALIASES_DETALHES,
+        "Valor": ["" if pd.isna(v) else str(v) for v in valores],
+    })
+
+
+def estilo_lote(feature: dict) -> dict:
+    """Estilo de um lote pela categoria (equivalente Python de _ESTILO_LOTES)."""
+    return {
+        "fillColor": CORES.get(feature["properties"]["categoria"], CORES["Sem Classificação"]),
+        "color": "black",
+        "weight": 0.5,
+        "fillOpacity": 0.7
+    }
+
+
+# Estilo da camada de lotes, avaliado no navegador a partir da categoria
+_ESTILO_LOTES = """function(feature) {
+    var cores = %s;
+    return {
+        fillColor: cores[feature.properties.categoria] || cores["Sem Classificação"],
+        color: "black",
+        weight: 0.5,
+        fillOpacity: 0.7
+    };
+}""" % json.dumps(CORES, ensure_ascii=False)
+
+
+def _camadas_serializadas(gdf, regiao, piramide, zoom) -> dict:
+    """
+    {categoria: GeoJSON (texto)} dos lotes da região no nível de
+    simplificação do zoom.
+    """
+    region_gdf = com_nivel(gdf[gdf["regiao_administrativa"] == regiao], piramide, zoom)
+    return {
+        cat: serializar_geojson(sub, CAMPOS_CAMADA, nome=f"lotes:{regiao}:{cat}")
+        for cat, sub in region_gdf.groupby("categoria")
+    }
+
+
+# ————————————————————————————————————————————————————————————————————
+# Recorte por município/distrito: as camadas vêm prontas da ingestão
+# (ingestao.materializar_camadas_municipios), sem filtrar nem serializar aqui
+def criar_mapa_municipio(
+    camadas: pd.DataFrame,
+    municipio: str,
+    extensoes: pd.DataFrame,
+    distrito: str = None
+) -> folium.Map:
+    """
+    Mapa dos lotes de um município a partir das camadas pré-serializadas
+    (índice = município; colunas 'categoria' e 'geojson'). Com `distrito`,
+    só os lotes do distrito são exibidos, recortados no navegador.
+    """
+    # 1) Enquadra o município
+    centro, limites = enquadramento(extensoes, "municipio", municipio)
+    m = folium.Map(location=centro, zoom_start=ZOOM_MUNICIPIO, width="95%", height="800px")
+    m.fit_bounds(limites)
+
+    # 2) Uma camada por categoria, direto do artefato
+    filtro = None
+    if distrito is not None:
+        filtro = "function(feature) { return feature.properties.distrito === %s; }" % (
+            escapar_script(json.dumps(distrito, ensure_ascii=False))
+        )
+    partes = camadas.loc[[municipio]] if municipio in camadas.index else camadas.iloc[:0]
+    por_categoria = dict(zip(partes["categoria"], partes["geojson"]))
+    for cat in CORES:
+        if cat in por_categoria:
+            CamadaGeoJson(por_categoria[cat], _ESTILO_LOTES, nome=cat, filtro=filtro).add_to(m)
+
+    # 3) Legenda e controle de camadas
+    _adicionar_legenda(m, municipio if distrito is None else f"{municipio} / {distrito}")
+    folium.LayerControl(collapsed=True).add_to(m)
+
+    return m
+
+
+# ————————————————————————————————————————————————————————————————————
+# Sobreposições entre lotes (ver modules/sobreposicoes.py)
+CAMPOS_SOBREPOSICAO = ["lote_a", "lote_b", "area_m2"]
+
+_ESTILO_SOBREPOSICAO = """function(feature) {
+    return {fillColor: "#e31a1c", color: "#e31a1c", weight: 1.5, fillOpacity: 0.6};
+}"""
+
+_TOOLTIP_SOBREPOSICAO = """function(feature) {
+    var p = feature.properties, esc = %s;
+    return "Lotes " + esc(p.lote_a) + " x " + esc(p.lote_b) + "<br>" + (p.area_m2 / 10000).toFixed(2) + " ha";
+}""" % ESCAPAR_HTML
+
+
+def camada_sobreposicoes(sobreposicoes: gpd.GeoDataFrame) -> CamadaGeoJson:
+    """Camada com os polígonos de interseção entre lotes, por cima dos lotes."""
+    texto = serializar_geojson(sobreposicoes, CAMPOS_SOBREPOSICAO, nome="sobreposicoes")
+    return CamadaGeoJson(
+        texto, _ESTILO_SOBREPOSICAO, nome="Sobreposições", tooltip=_TOOLTIP_SOBREPOSICAO
+    )
+
+
+# Contorno das regiões administrativas (ingestao.materializar_regioes): só
+# traço, sem preenchimento, para não esconder nem capturar os cliques dos lotes
+_ESTILO_REGIOES = """function(feature, destaque) {
+    var ativa = feature.properties.regiao_administrativa === destaque;
+    return {
+        fill: false,
+        color: ativa ? "#222222" : "#555555",
+        weight: ativa ? 3 : 1.5,
+        dashArray: ativa ? null : "4 4"
+    };
+}"""
+
+_TOOLTIP_REGIOES = """function(feature) {
+    return (%s)(feature.properties.regiao_administrativa);
+}""" % ESCAPAR_HTML
+
+
+def camada_regioes(
+    regioes: gpd.GeoDataFrame, zoom: int, piramide: gpd.GeoDataFrame = None, destaque: str = None,
+    cache: CacheDisco = None, versao: str = None
+) -> CamadaGeoJson:
+    """
+    Camada de contornos das regiões (indexadas por 'regiao_administrativa'),
+    no nível da pirâmide do zoom; a região `destaque` sai em traço cheio.
+    Com `cache`, o GeoJSON de cada nível é serializado uma vez por versão.
+    """
+    nivel = nivel_para_zoom(zoom)
+
+    def serializar():
+        gdf = com_nivel(regioes, piramide, zoom).reset_index()
+        return serializar_geojson(gdf, ["regiao_administrativa"], nome=f"regioes:{nivel}").encode()
+
+    if cache is not None:
+        texto = cache.obter_ou_gerar(CacheDisco.chave(versao, "regioes", nivel), serializar).decode()
+    else:
+        texto = serializar().decode()
+    estilo = "function(feature) { return (%s)(feature, %s); }" % (
+        _ESTILO_REGIOES, escapar_script(json.dumps(destaque, ensure_ascii=False))
     )
+    return CamadaGeoJson(texto, estilo, nome="Regiões administrativas", tooltip=_TOOLTIP_REGIOES)
+
+
+# ————————————————————————————————————————————————————————————————————
+# Modo "troca no navegador": todas as regiões vão numa só página e a troca
+# de região/categoria não passa pelo servidor (ver camadas.SeletorRegioes)
+TODAS_REGIOES = "Todas as regiões"
+
+
+def criar_mapa_regioes_cliente(
+    camadas: pd.DataFrame,
+    extensoes: pd.DataFrame,
+    regioes: gpd.GeoDataFrame = None,
+    piramide_regioes: gpd.GeoDataFrame = None,
+    inicial: str = None
+) -> folium.Map:
+    """
+    Mapa do estado com os lotes de todas as regiões, a partir das camadas
+    pré-serializadas por região (ingestao.materializar_camadas_regioes;
+    índice = região, colunas 'categoria' e 'geojson'), embutidas uma única
+    vez. A região exibida é escolhida num seletor dentro do mapa e as
+    categorias no controle de camadas, ambos no navegador. Com `regioes`
+    (ingestao.materializar_regioes), o contorno acompanha a região escolhida.
+    """
+    # 1) Mapa do estado e enquadramento de cada região
+    centro, limites_estado = _enquadrar_estado(extensoes)
+    m = folium.Map(location=centro, zoom_start=7, width="95%", height="800px")
+    m.fit_bounds(limites_estado)
+    ext = extensoes[extensoes["nivel"] == "regiao"].sort_values("entidade")
+    limites = {TODAS_REGIOES: limites_estado}
+    for r in ext.itertuples():
+        limites[r.entidade] = [[r.miny, r.minx], [r.maxy, r.maxx]]
+
+    # 2) {categoria: {região: FeatureCollection}} montado como texto, sem reler os GeoJSON
+    dados = {}
+    for regiao, cat, texto in zip(camadas.index, camadas["categoria"], camadas["geojson"]):
+        chave = escapar_script(json.dumps(regiao, ensure_ascii=False))
+        dados.setdefault(cat, []).append(f"{chave}:{texto}")
+    texto_dados = "{%s}" % ",".join(
+        f"{escapar_script(json.dumps(cat, ensure_ascii=False))}:{{{','.join(partes)}}}"
+        for cat, partes in dados.items()
+    )
+
+    # 3) Um grupo (vazio) por categoria, preenchido no navegador
+    grupos = {}
+    for cat in CORES:
+        if cat in dados:
+            grupos[cat] = folium.FeatureGroup(name=cat).add_to(m)
+
+    contorno = None
+    if regioes is not None:
+        contorno = camada_regioes(regioes, ZOOM_REGIAO, piramide_regioes).add_to(m)
+
+    if inicial not in limites:
+        inicial = ext["entidade"].iloc[0] if len(ext) else TODAS_REGIOES
+    m.add_child(SeletorRegioes(
+        grupos, texto_dados, _ESTILO_LOTES, limites, inicial,
+        contorno=contorno, estilo_contorno=_ESTILO_REGIOES, todas=TODAS_REGIOES,
+    ))
+
+    # 4) Legenda e controle de camadas
+    _adicionar_legenda(m, "Ceará")
+    folium.LayerControl(collapsed=True).add_to(m)
+
+    return m
+
+
+# ————————————————————————————————————————————————————————————————————
+# Modo "janela visível": o mapa base cobre o estado e só os lotes da janela
+# atual (bounds/zoom devolvidos pelo st_folium) são enviados ao navegador
+def criar_mapa_estado(extensoes: pd.DataFrame) -> folium.Map:
+    """Mapa base do estado inteiro, sem lotes (ver camada_janela)."""
+    centro, limites = _enquadrar_estado(extensoes)
+    m = folium.Map(location=centro, zoom_start=7)
+    m.fit_bounds(limites)
+    _adicionar_legenda(m, "Ceará")
+    return m
+
+
+def camada_janela(
+    gdf: gpd.GeoDataFrame,
+    indice,
+    limites,
+    zoom: int,
+    piramide: gpd.GeoDataFrame = None,
+    grade: gpd.GeoDataFrame = None,
+    limite: int = LIMITE_LOTES_JANELA
+) -> folium.FeatureGroup:
+    """
+    FeatureGroup com o conteúdo da janela [[sul, oeste], [norte, leste]]
+    (None = todos os lotes): os lotes que a tocam (consultados no índice
+    espacial, ver indice_espacial.construir_indice), no nível da pirâmide do
+    zoom; ou, abaixo de ZOOM_MIN_LOTES ou acima de `limite` lotes, as células
+    da grade hexagonal na resolução do zoom. `grade` é a grade materializada
+    (grade.materializar_grade); sem ela, as células são calculadas na hora.
+    """
+    fg = folium.FeatureGroup(name="Lotes")
+
+    # 1) Lotes que tocam a janela
+    janela_gdf = gdf if limites is None else gdf.iloc[lotes_na_janela(indice, limites)]
+    if janela_gdf.empty:
+        return fg
+
+    # 2) Zoom baixo ou lotes demais: grade agregada
+    if zoom < ZOOM_MIN_LOTES or len(janela_gdf) > limite:
+        tamanho = tamanho_para_zoom(zoom)
+        if grade is None:
+            celulas = agregar_em_grade(janela_gdf, tamanho)
+        else:
+            celulas = grade[grade["tamanho"] == tamanho]
+            if limites is not None:
+                (sul, oeste), (norte, leste) = limites
+                celulas = celulas.cx[oeste:leste, sul:norte]
+        texto = serializar_geojson(celulas, CAMPOS_GRADE, nome="lotes:grade")
+        CamadaGeoJson(texto, _ESTILO_GRADE, nome="Grade", tooltip=_TOOLTIP_GRADE).add_to(fg)
+        return fg
+
+    # 3) Polígonos no nível de simplificação do zoom
+    janela_gdf = com_nivel(janela_gdf, piramide, zoom)
+    for cat, sub in janela_gdf.groupby("categoria"):
+        texto = serializar_geojson(sub, CAMPOS_CAMADA, nome=f"lotes:janela:{cat}")
+        CamadaGeoJson(texto, _ESTILO_LOTES, nome=cat).add_to(fg)
+    return fg
 
-    # 4) Inicia o mapa centrado
+
+# Células da grade: cor pela categoria dominante, opacidade pela contagem
+CAMPOS_GRADE = ["n", "area_total", "dominante"]
+
+_ESTILO_GRADE = """function(feature) {
+    var cores = %s;
+    var p = feature.properties;
+    return {
+        fillColor: cores[p.dominante] || cores["Sem Classificação"],
+        color: "white",
+        weight: 0.5,
+        fillOpacity: Math.min(0.9, 0.3 + 0.2 * Math.log10(1 + p.n))
+    };
+}""" % json.dumps(CORES, ensure_ascii=False)
+
+_TOOLTIP_GRADE = """function(feature) {
+    var p = feature.properties, esc = %s;
+    return p.n + " lotes<br>" + Math.round(p.area_total) + " ha<br>" + esc(p.dominante);
+}""" % ESCAPAR_HTML
+
+
+def _enquadrar_estado(extensoes: pd.DataFrame):
+    """Centro e limites do estado, a partir das extensões das regiões."""
+    regioes = extensoes[extensoes["nivel"] == "regiao"]
+    sul, oeste = regioes["miny"].min(), regioes["minx"].min()
+    norte, leste = regioes["maxy"].max(), regioes["maxx"].max()
+    return [(sul + norte) / 2, (oeste + leste) / 2], [[sul, oeste], [norte, leste]]
+
+
+# ————————————————————————————————————————————————————————————————————
+# Modo "tiles vetoriais": a página só carrega os tiles da janela/zoom atuais
+_ESTILO_TILES = """{
+    "interactive": true,
+    "maxNativeZoom": %(zoom_max)d,
+    "vectorTileLayerStyles": {
+        "lotes": function(p, zoom) {
+            var cores = %(cores)s;
+            if (p.regiao_administrativa !== %(regiao)s) {
+                return {fill: false, stroke: false};
+            }
+            return {
+                fill: true,
+                fillColor: cores[p.categoria] || cores["Sem Classificação"],
+                color: "black",
+                weight: 0.5,
+                fillOpacity: 0.7
+            };
+        }
+    }
+}"""
+
+# (concatenado: o template Jinja não admite a formatação com %)
+_POPUP_TILES = """
+{% macro script(this, kwargs) %}
+{{ this.camada.get_name() }}.on('click', function(e) {
+    var p = e.layer.properties, esc = """ + ESCAPAR_HTML + """;
+    L.popup()
+     .setLatLng(e.latlng)
+     .setContent(
+        "<strong>Nome:</strong> " + esc(p.imovel) + "<br>" +
+        "<strong>INCRA:</strong> " + esc(p.numero_incra) + "<br>" +
+        "<strong>Situação:</strong> " + esc(p.situacao_juridica) + "<br>" +
+        "<strong>Município:</strong> " + esc(p.nome_municipio) + "<br>" +
+        "<strong>Distrito:</strong> " + esc(p.distrito) + "<br>" +
+        "<strong>Área:</strong> " + esc(p.area) + " ha<br>" +
+        "<strong>Categoria:</strong> " + esc(p.categoria))
+     .openOn({{ this._parent.get_name() }});
+});
+{% endmacro %}
+"""
+
+
+def criar_mapa_tiles_vetoriais(
+    gdf: gpd.GeoDataFrame,
+    regiao: str,
+    url_tiles: str,
+    zoom_max: int = 14,
+    extensoes: pd.DataFrame = None
+) -> folium.Map:
+    """
+    Variante de criar_mapa_com_camadas que não embute nenhuma geometria:
+    os lotes vêm de vector tiles pré-gerados (ver modules/tiles_vetoriais.py),
+    então o peso da página não depende do tamanho da região.
+    """
+    # 1) Enquadra a região
+    centro, limites = _enquadrar_regiao(gdf, regiao, extensoes)
     m = folium.Map(
-        location=[centro_wgs84.y, centro_wgs84.x],
+        location=centro,
         zoom_start=10,
         width="95%",
         height="800px"
     )
+    m.fit_bounds(limites)
 
-    # 5) Cria um FeatureGroup para cada categoria
-    grupos = {cat: folium.FeatureGroup(name=cat) for cat in CORES.keys()}
-    for fg in grupos.values():
-        m.add_child(fg)
+    # 2) Camada de tiles com estilo por categoria, calculado no navegador
+    opcoes = _ESTILO_TILES % {
+        "zoom_max": zoom_max,
+        "cores": json.dumps(CORES, ensure_ascii=False),
+        "regiao": escapar_script(json.dumps(regiao, ensure_ascii=False)),
+    }
+    camada = VectorGridProtobuf(url_tiles, "Lotes", opcoes)
+    camada.add_to(m)
+
+    # 3) Popup de detalhes a partir das propriedades do tile clicado
+    popup = MacroElement()
+    popup._template = Template(_POPUP_TILES)
+    popup.camada = camada
+    m.add_child(popup)
+
+    # 4) Legenda e controle de camadas
+    _adicionar_legenda(m, regiao)
+    folium.LayerControl(collapsed=True).add_to(m)
+
+    return m
+
+
+def _enquadrar_regiao(gdf: gpd.GeoDataFrame, regiao: str, extensoes: pd.DataFrame = None):
+    """
+    Centro e limites da região: da tabela pré-calculada na ingestão ou, na
+    falta dela, do bounding box dos lotes (já em WGS84, sem reprojeção).
+    """
+    if extensoes is not None:
+        return enquadramento(extensoes, "regiao", regiao)
 
-    # 6) Adiciona as geometrias da região selecionada
     region_gdf = gdf[gdf["regiao_administrativa"] == regiao]
-    for _, row in region_gdf.iterrows():
-        fg = grupos.get(row["categoria"])
-        if fg:
-            folium.GeoJson(
-                row.geometry,
-                style_function=lambda feat, cat=row["categoria"]: {
-                    "fillColor": CORES[cat],
-                    "color": "black",
-                    "weight": 0.5,
-                    "fillOpacity": 0.7
-                },
-                popup=folium.Popup(
-                    html=(
-                        f"<strong>Nome:</strong> {row.get('imovel','')}<br>"
-                        f"<strong>INCRA:</strong> {row.get('numero_incra','')}<br>"
-                        f"<strong>Situação:</strong> {row.get('situacao_juridica','')}<br>"
-                        f"<strong>Município:</strong> {row.get('nome_municipio','')}<br>"
-                        f"<strong>Distrito:</strong> {row.get('distrito','')}<br>"
-                        f"<strong>Área:</strong> {row['area']} ha<br>"
-                        f"<strong>Categoria:</strong> {row['categoria']}"
-                    )
-                )
-            ).add_to(fg)
-
-    # 7) Adiciona legenda estática
+    if region_gdf.empty:
+        raise ValueError(f"Nenhum dado válido encontrado para: {regiao}")
+    xmin, ymin, xmax, ymax = region_gdf.total_bounds
+    return [(ymin + ymax) / 2, (xmin + xmax) / 2], [[ymin, xmin], [ymax, xmax]]
+
+
+def _adicionar_legenda(m: folium.Map, regiao: str) -> None:
     legend = f"""
     <div style="
         position: fixed; top: 150px; right: 150px; z-index:1000;
@@ -214,9 +667,4 @@ def criar_mapa_com_camadas(gdf: gpd.GeoDataFrame, regiao: str) -> folium.Map:
       {'<br>'.join([f'<i style="color:{c}">■</i> {cat}' for cat,c in CORES.items()])}
     </div>
     """
-    m.get_root().html.add_child(folium.Element(legend))
-
-    # 8) Controla as camadas
-    folium.LayerControl(collapsed=True).add_to(m)
-
-    return m
\ No newline at end of file
+    m.get_root().html.add_child(folium.Element(legend))
\ No newline at end of file
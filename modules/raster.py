@@ -0,0 +1,54 @@
+# modules/raster.py
+
+"""
+Pré-renderização dos coropléticos em imagem estática (PNG/SVG), no servidor:
+- rasterizar_coropletico(gdf, estilo, campos, largura, formato)
+
+A imagem é a primeira pintura da página: pesa dezenas de KB e aparece
+antes de a camada interativa (GeoJSON/TopoJSON) ser baixada. O cache por
+versão do dataset e métrica fica a cargo de quem chama (ver CacheDisco).
+"""
+
+import io
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+import geopandas as gpd
+
+_DPI = 100
+
+
+def rasterizar_coropletico(
+    gdf: gpd.GeoDataFrame, estilo, campos: list, largura: int = 900, formato: str = 'png'
+) -> bytes:
+    """
+    Imagem `formato` ('png' ou 'svg', fundo transparente) do coroplético de `gdf`, em Web Mercator. A cor
+    de cada polígono sai da mesma função de estilo usada pelo folium
+    (`estilo(feature) -> {'fillColor', 'fillOpacity', 'color', 'weight'}`),
+    aplicada às `campos` de cada linha, para que prévia e mapa coincidam.
+    """
+    merc = gdf[gdf.geometry.notna()].to_crs(epsg=3857)
+
+    # 1) Estilo de cada feição, como no navegador
+    estilos = [
+        estilo({'properties': props})
+        for props in merc.reindex(columns=campos).to_dict('records')
+    ]
+    preenchimento = [to_rgba(e['fillColor'], e.get('fillOpacity', 1.0)) for e in estilos]
+    contorno = estilos[0].get('color', 'black') if estilos else 'black'
+    espessura = 0.6 * estilos[0].get('weight', 0.5) if estilos else 0.3
+
+    # 2) Figura do tamanho exato da extensão, sem eixos nem margens
+    xmin, ymin, xmax, ymax = merc.total_bounds
+    altura = largura * (ymax - ymin) / (xmax - xmin)
+    # Figure direta (canvas Agg), sem pyplot: nada fica registrado entre requisições
+    fig = Figure(figsize=(largura / _DPI, altura / _DPI), dpi=_DPI)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    merc.plot(ax=ax, color=preenchimento, edgecolor=contorno, linewidth=espessura)
+    ax.set_xlim(xmin, xmax)
+    ax.set_ylim(ymin, ymax)
+
+    # 3) Serializa
+    buf = io.BytesIO()
+    fig.savefig(buf, format=formato, transparent=True, dpi=_DPI)
+    return buf.getvalue()
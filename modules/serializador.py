@@ -0,0 +1,98 @@
+# modules/serializador.py
+
+"""
+Serialização compacta das camadas dos mapas:
+- serializar_geojson(gdf, propriedades, precisao, nome)
+- serializar_topojson(gdf, propriedades, precisao, nome)
+- escapar_script(texto)
+
+Só as propriedades da lista branca (tooltip/estilo) são emitidas, as
+coordenadas são quantizadas em `precisao` casas decimais (5 casas ≈ 1 m), o
+JSON é gerado com orjson quando disponível e sai pronto para ser embutido num
+<script> (ver escapar_script). O tamanho em bytes de cada camada
+nomeada vai para o log; o que a página de fato embute é medido por
+camadas.tamanho_camadas(mapa).
+"""
+
+import json
+import logging
+import numpy as np
+import geopandas as gpd
+import shapely
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:  # encoder padrão, sem espaços
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+logger = logging.getLogger(__name__)
+
+# '<', '>' e '&' só aparecem dentro de strings JSON, onde \u003c etc. são
+# equivalentes; escapados, os dados nunca fecham o <script> em que são
+# embutidos ('</script>') nem abrem um comentário HTML ('<!--')
+_ESCAPES_SCRIPT = str.maketrans({'<': '\\u003c', '>': '\\u003e', '&': '\\u0026'})
+
+
+def escapar_script(texto: str) -> str:
+    """Texto JSON seguro para embutir tal como está num <script> da página."""
+    return texto.translate(_ESCAPES_SCRIPT)
+
+def _registrar(nome: str, texto: str) -> str:
+    if nome:
+        logger.info("camada %s: %d bytes", nome, len(texto.encode()))
+    return texto
+
+
+def _quantizar(gdf: gpd.GeoDataFrame, precisao: int) -> np.ndarray:
+    geoms = np.asarray(gdf.geometry.array)
+    return shapely.transform(geoms, lambda c: np.round(c, precisao))
+
+
+def _registros(gdf: gpd.GeoDataFrame, propriedades: list) -> list:
+    props = gdf.reindex(columns=propriedades)
+    return props.astype(object).where(props.notna(), None).to_dict('records')
+
+
+def serializar_geojson(
+    gdf: gpd.GeoDataFrame, propriedades: list, precisao: int = 5, nome: str = None
+) -> str:
+    """
+    FeatureCollection (texto GeoJSON) com as geometrias quantizadas e só as
+    `propriedades` pedidas. Geometrias saem de uma única chamada vetorizada a
+    shapely.to_geojson.
+    """
+    geoms = shapely.to_geojson(_quantizar(gdf, precisao))
+    feicoes = ",".join(
+        f'{{"type":"Feature","properties":{_dumps(p)},"geometry":{g}}}'
+        for p, g in zip(_registros(gdf, propriedades), geoms)
+    )
+    return _registrar(nome, escapar_script(f'{{"type":"FeatureCollection","features":[{feicoes}]}}'))
+
+
+def serializar_topojson(
+    gdf: gpd.GeoDataFrame, propriedades: list, precisao: int = 5, nome: str = None
+) -> str:
+    """
+    Mesma camada em TopoJSON: fronteiras compartilhadas (ex.: entre municípios)
+    viram um único arco, codificado em inteiros delta. O objeto fica em
+    'objects.data' (ver camadas.CamadaTopoJson).
+    """
+    try:
+        import topojson
+    except ImportError as e:
+        raise ImportError("Serialização TopoJSON requer o pacote 'topojson'.") from e
+
+    camada = gpd.GeoDataFrame(
+        gdf.reindex(columns=propriedades),
+        geometry=_quantizar(gdf, precisao),
+        crs=gdf.crs,
+    )
+    # grade de quantização com o mesmo passo de `precisao` casas decimais
+    xmin, ymin, xmax, ymax = camada.total_bounds
+    passos = int(max(xmax - xmin, ymax - ymin) * 10 ** precisao) + 1
+    topo = topojson.Topology(camada, prequantize=passos, object_name='data')
+    return _registrar(nome, escapar_script(_dumps(topo.to_dict())))
@@ -0,0 +1,134 @@
+# modules/sobreposicoes.py
+
+"""
+Detecção de sobreposição entre lotes:
+- detectar_sobreposicoes(gdf, area_min_m2, processos)
+- materializar_sobreposicoes(_gdf, base_folder, versao, processos)
+- carregar_sobreposicoes(base_folder, versao)
+- resumo_sobreposicoes(sobreposicoes)
+
+Os pares candidatos saem de uma única consulta em lote ao STRtree (bounding
+boxes que se tocam e geometrias que se intersectam); só para eles a área da
+interseção é calculada, em blocos vetorizados distribuídos num pool de
+processos. Lotes que apenas encostam (interseção sem área) são descartados.
+A tabela é gerada fora do app (util/detectar_sobreposicoes.py), que só a lê.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+from .artefatos import carregar_artefato, carregar_ou_materializar
+from .ingestao import CRS_METRICO, CRS_EXIBICAO, geometrias_metricas
+
+# pares por bloco de interseções e, abaixo disto, tudo no próprio processo
+_TAMANHO_BLOCO = 20000
+_MIN_PARES_POOL = 2 * _TAMANHO_BLOCO
+
+# atributos do primeiro lote de cada par levados para a tabela
+_ATRIBUTOS = ['nome_municipio', 'regiao_administrativa']
+
+
+def _intersecoes(a: np.ndarray, b: np.ndarray):
+    """Interseções e suas áreas para um bloco de pares (vetorizado)."""
+    inter = shapely.intersection(a, b)
+    return inter, shapely.area(inter)
+
+
+def _em_blocos(a: np.ndarray, b: np.ndarray, processos: int = None):
+    cortes = range(0, len(a), _TAMANHO_BLOCO)
+    if len(a) < _MIN_PARES_POOL:
+        partes = [_intersecoes(a[i:i + _TAMANHO_BLOCO], b[i:i + _TAMANHO_BLOCO]) for i in cortes]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            partes = list(pool.map(
+                _intersecoes,
+                [a[i:i + _TAMANHO_BLOCO] for i in cortes],
+                [b[i:i + _TAMANHO_BLOCO] for i in cortes],
+            ))
+    if not partes:
+        return np.array([], dtype=object), np.array([], dtype=float)
+    return np.concatenate([p[0] for p in partes]), np.concatenate([p[1] for p in partes])
+
+
+def detectar_sobreposicoes(
+    gdf: gpd.GeoDataFrame, area_min_m2: float = 1.0, processos: int = None
+) -> gpd.GeoDataFrame:
+    """
+    Um registro por par de lotes sobrepostos, com colunas ['lote_a',
+    'lote_b', 'area_m2', 'frac_a', 'frac_b', 'nome_municipio',
+    'regiao_administrativa', 'geometry']: identificadores dos lotes
+    ('lote_id' se houver, senão o índice), área da interseção, fração de
+    cada lote coberta, município/região do lote A e o polígono da
+    interseção em CRS_EXIBICAO.
+    """
+    geoms = geometrias_metricas(gdf)
+
+    # 1) Pares candidatos numa só consulta; cada par uma vez (i < j)
+    i, j = shapely.STRtree(geoms).query(geoms, predicate='intersects')
+    manter = i < j
+    i, j = i[manter], j[manter]
+
+    # 2) Interseções e áreas em blocos
+    inter, area = _em_blocos(geoms[i], geoms[j], processos)
+    manter = area >= area_min_m2
+    i, j, inter, area = i[manter], j[manter], inter[manter], area[manter]
+
+    # 3) Tabela
+    ids = gdf['lote_id'].to_numpy() if 'lote_id' in gdf.columns else gdf.index.to_numpy()
+    area_lote = shapely.area(geoms)
+    tabela = pd.DataFrame({
+        'lote_a': ids[i],
+        'lote_b': ids[j],
+        'area_m2': area,
+        'frac_a': area / area_lote[i],
+        'frac_b': area / area_lote[j],
+    })
+    for col in _ATRIBUTOS:
+        if col in gdf.columns:
+            tabela[col] = gdf[col].to_numpy()[i]
+
+    geometria = gpd.GeoSeries(inter, crs=CRS_METRICO).to_crs(CRS_EXIBICAO)
+    return gpd.GeoDataFrame(tabela, geometry=geometria.values, crs=CRS_EXIBICAO)
+
+
+def materializar_sobreposicoes(
+    _gdf: gpd.GeoDataFrame, base_folder: str, versao: str, processos: int = None
+) -> gpd.GeoDataFrame:
+    """Lê ou grava a tabela de sobreposições da versão do dataset."""
+    return carregar_ou_materializar(
+        base_folder, versao, 'sobreposicoes',
+        lambda: detectar_sobreposicoes(_gdf, processos=processos), geo=True
+    )
+
+
+def carregar_sobreposicoes(base_folder: str, versao: str) -> gpd.GeoDataFrame:
+    """
+    Lê a tabela gerada por util/detectar_sobreposicoes.py, sem nunca
+    materializá-la; FileNotFoundError se ainda não existir.
+    """
+    return carregar_artefato(base_folder, versao, 'sobreposicoes', geo=True)
+
+
+def resumo_sobreposicoes(sobreposicoes: pd.DataFrame) -> pd.DataFrame:
+    """Por município: pares sobrepostos, lotes envolvidos e área sobreposta (ha)."""
+    if sobreposicoes.empty:
+        return pd.DataFrame(columns=['Município', 'Pares', 'Lotes envolvidos', 'Área sobreposta (ha)'])
+
+    lotes = pd.concat([
+        sobreposicoes[['nome_municipio', 'lote_a']].set_axis(['nome_municipio', 'lote'], axis=1),
+        sobreposicoes[['nome_municipio', 'lote_b']].set_axis(['nome_municipio', 'lote'], axis=1),
+    ])
+    resumo = pd.DataFrame({
+        'Pares': sobreposicoes.groupby('nome_municipio').size(),
+        'Lotes envolvidos': lotes.groupby('nome_municipio')['lote'].nunique(),
+        'Área sobreposta (ha)': sobreposicoes.groupby('nome_municipio')['area_m2'].sum() / 10000,
+    })
+    return (
+        resumo.rename_axis('Município')
+        .sort_values('Área sobreposta (ha)', ascending=False)
+        .reset_index()
+    )
@@ -0,0 +1,127 @@
+# modules/tiles_vetoriais.py
+
+"""
+Vector tiles (Mapbox Vector Tile) da camada de lotes:
+- gerar_tiles_lotes(gdf, diretorio, zoom_min, zoom_max)
+- url_tiles_lotes(versao)
+- tiles_disponiveis(versao)
+
+Os tiles são gravados em static/tiles/<versao>/lotes/{z}/{x}/{y}.pbf e
+servidos pelo próprio Streamlit (server.enableStaticServing), de modo que o
+mapa baixa só os tiles da janela e do zoom atuais.
+"""
+
+import os
+import numpy as np
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+# Pasta servida pelo Streamlit em /app/static/
+_STATIC_DIR = 'static'
+_CAMADA     = 'lotes'
+_EXTENSAO   = 4096
+# meia largura do mundo em Web Mercator (EPSG:3857)
+_ORIGEM     = 20037508.342789244
+
+# Atributos embutidos em cada feição (estilo + popup)
+PROPRIEDADES_TILE = [
+    'categoria', 'regiao_administrativa', 'nome_municipio',
+    'imovel', 'numero_incra', 'situacao_juridica', 'distrito', 'area',
+]
+
+
+def diretorio_tiles(versao: str) -> str:
+    return os.path.join(_STATIC_DIR, 'tiles', versao, _CAMADA)
+
+
+def url_tiles_lotes(versao: str) -> str:
+    """Template XYZ a partir da raiz do servidor (o mapa roda dentro de um iframe)."""
+    return f"/app/static/tiles/{versao}/{_CAMADA}/{{z}}/{{x}}/{{y}}.pbf"
+
+
+def tiles_disponiveis(versao: str) -> bool:
+    return os.path.isdir(diretorio_tiles(versao))
+
+
+def _propriedades(gdf: pd.DataFrame) -> list:
+    """Converte os atributos para tipos aceitos pelo MVT (sem NaN/None)."""
+    cols = [c for c in PROPRIEDADES_TILE if c in gdf.columns]
+    props = gdf[cols].copy()
+    for col in cols:
+        if pd.api.types.is_numeric_dtype(props[col]):
+            props[col] = props[col].astype(float).fillna(0.0)
+        else:
+            props[col] = props[col].fillna('').astype(str)
+    return props.to_dict('records')
+
+
+def gerar_tiles_lotes(
+    gdf: gpd.GeoDataFrame, diretorio: str, zoom_min: int = 7, zoom_max: int = 14
+) -> int:
+    """
+    Gera os tiles .pbf de todos os lotes para os zooms [zoom_min, zoom_max].
+    Para cada zoom, as faixas de tiles cobertas por cada lote são calculadas
+    de forma vetorizada a partir dos bounds; cada tile recorta apenas os lotes
+    que o tocam. Retorna o número de tiles gravados.
+    """
+    try:
+        import mapbox_vector_tile
+    except ImportError as e:
+        raise ImportError(
+            "Geração de vector tiles requer o pacote 'mapbox-vector-tile'."
+        ) from e
+
+    merc = gdf.to_crs(epsg=3857)
+    geoms = np.asarray(merc.geometry.array)
+    props = _propriedades(merc)
+    b = shapely.bounds(geoms)
+    n = len(geoms)
+
+    gravados = 0
+    for z in range(zoom_min, zoom_max + 1):
+        tam = 2 * _ORIGEM / 2 ** z
+
+        # 1) Faixa de tiles (x0..x1, y0..y1) de cada lote, com y crescendo para o sul
+        x0 = np.floor((b[:, 0] + _ORIGEM) / tam).astype(np.int64)
+        x1 = np.floor((b[:, 2] + _ORIGEM) / tam).astype(np.int64)
+        y0 = np.floor((_ORIGEM - b[:, 3]) / tam).astype(np.int64)
+        y1 = np.floor((_ORIGEM - b[:, 1]) / tam).astype(np.int64)
+
+        # 2) Expande cada lote nos pares (lote, tile) que ele cobre
+        nx, ny = x1 - x0 + 1, y1 - y0 + 1
+        k = nx * ny
+        lote = np.repeat(np.arange(n), k)
+        desloc = np.arange(k.sum()) - np.repeat(np.cumsum(k) - k, k)
+        tx = x0[lote] + desloc % nx[lote]
+        ty = y0[lote] + desloc // nx[lote]
+
+        # 3) Agrupa por tile e codifica
+        ordem = np.lexsort((ty, tx))
+        lote, tx, ty = lote[ordem], tx[ordem], ty[ordem]
+        cortes = np.flatnonzero((np.diff(tx) != 0) | (np.diff(ty) != 0)) + 1
+        for ids in np.split(np.arange(len(lote)), cortes):
+            x, y = tx[ids[0]], ty[ids[0]]
+            limites = (
+                x * tam - _ORIGEM, _ORIGEM - (y + 1) * tam,
+                (x + 1) * tam - _ORIGEM, _ORIGEM - y * tam,
+            )
+            recortes = shapely.clip_by_rect(geoms[lote[ids]], *limites)
+            feicoes = [
+                {'geometry': g, 'properties': props[i]}
+                for g, i in zip(recortes, lote[ids]) if not g.is_empty
+            ]
+            if not feicoes:
+                continue
+
+            pbf = mapbox_vector_tile.encode(
+                [{'name': _CAMADA, 'features': feicoes}],
+                default_options={'quantize_bounds': limites, 'extents': _EXTENSAO},
+            )
+            path = os.path.join(diretorio, str(z), str(x), f"{y}.pbf")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(pbf)
+            gravados += 1
+
+    return gravados
@@ -0,0 +1,28 @@
+"""
+Detecta, ao publicar um dataset, as sobreposições entre lotes exibidas pelo
+mapa interativo (opção "Sobreposições") e as grava como artefato da versão.
+Rodar a partir da raiz do projeto:
+
+    python util/detectar_sobreposicoes.py [pasta_dados] [processos]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import (
+    load_csv_data, materializar_geometrias, materializar_sobreposicoes, validate_data,
+    versao_dataset,
+)
+
+if __name__ == "__main__":
+    pasta = sys.argv[1] if len(sys.argv) > 1 else "data/"
+    processos = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    inicio = time.time()
+    versao = versao_dataset(pasta)
+    df_raw = load_csv_data(pasta)
+    _, _, gdf_inter, _, _ = validate_data(df_raw, materializar_geometrias(df_raw, pasta, versao))
+
+    sobreposicoes = materializar_sobreposicoes(gdf_inter, pasta, versao, processos)
+    print(f"{len(sobreposicoes)} pares de lotes sobrepostos ({time.time() - inicio:.1f}s)")
@@ -0,0 +1,45 @@
+"""
+Exporta, sem navegador, as imagens estáticas dos mapas para relatórios: os
+coropléticos do estado (categoria dominante e Gini) e os lotes de cada região
+administrativa e de cada município. Rodar a partir da raiz do projeto:
+
+    python util/exportar_mapas.py [pasta_dados] [destino] [png|svg] [processos]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import (
+    load_csv_data, load_municipios, materializar_geometrias, materializar_metricas,
+    preparar_dados, validate_data, versao_dataset,
+)
+from modules.exportacao import exportar_mapas, tarefas_exportacao
+
+if __name__ == "__main__":
+    pasta = sys.argv[1] if len(sys.argv) > 1 else "data/"
+    destino = sys.argv[2] if len(sys.argv) > 2 else "public/mapas"
+    formato = sys.argv[3] if len(sys.argv) > 3 else "png"
+    processos = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    inicio = time.time()
+    versao = versao_dataset(pasta)
+    df_raw = load_csv_data(pasta)
+    _, df_class, gdf_inter, df_ctx, _ = validate_data(
+        df_raw, materializar_geometrias(df_raw, pasta, versao)
+    )
+    municipios = load_municipios(pasta)
+
+    # Coroplético de dominância
+    gdf_ctx = preparar_dados(df_ctx, municipios)
+
+    # Coroplético de Gini: métricas por município casadas pelo nome normalizado
+    metricas = materializar_metricas(df_class, pasta, versao)
+    metricas = metricas[metricas["nivel"] == "municipio"].rename(columns={"entidade": "nome_municipio"})
+    norm = df_class[["nome_municipio", "municipio_norm"]].drop_duplicates("nome_municipio")
+    gini = metricas.merge(norm, on="nome_municipio")[["municipio_norm", "gini", "n_lotes"]]
+    gdf_gini = municipios.merge(gini, on="municipio_norm", how="left")
+
+    tarefas = tarefas_exportacao(gdf_inter, gdf_ctx, gdf_gini)
+    caminhos = exportar_mapas(tarefas, destino, formato, processos)
+    print(f"{len(caminhos)} mapas gravados em {destino} ({time.time() - inicio:.1f}s)")
@@ -0,0 +1,24 @@
+"""
+Pré-gera os vector tiles (MVT) dos lotes usados pelo modo "Tiles vetoriais"
+do mapa interativo. Rodar a partir da raiz do projeto, a cada novo dataset:
+
+    python util/gerar_tiles.py [pasta_dados] [zoom_min] [zoom_max]
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import load_csv_data, materializar_geometrias, validate_data, versao_dataset
+from modules.tiles_vetoriais import diretorio_tiles, gerar_tiles_lotes
+
+pasta = sys.argv[1] if len(sys.argv) > 1 else "data/"
+zoom_min = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+zoom_max = int(sys.argv[3]) if len(sys.argv) > 3 else 14
+
+versao = versao_dataset(pasta)
+df_raw = load_csv_data(pasta)
+_, _, gdf_inter, _, _ = validate_data(df_raw, materializar_geometrias(df_raw, pasta, versao))
+
+destino = diretorio_tiles(versao)
+total = gerar_tiles_lotes(gdf_inter, destino, zoom_min, zoom_max)
+print(f"{total} tiles gravados em: {destino}")
@@ -0,0 +1,36 @@
+"""
+Pré-renderiza, ao publicar um dataset, os gráficos (PNG e Vega-Lite) e os
+quadros da página "Gráficos" para o estado, cada região administrativa e
+cada município, gravando-os como artefato da versão. Rodar a partir da raiz
+do projeto:
+
+    python util/prerenderizar_graficos.py [pasta_dados] [processos]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import (
+    com_municipio_espacial, load_csv_data, load_municipios, materializar_escopos,
+    materializar_geometrias, materializar_metricas, materializar_municipios_lotes,
+    validate_data, versao_dataset,
+)
+
+if __name__ == "__main__":
+    pasta = sys.argv[1] if len(sys.argv) > 1 else "data/"
+    processos = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    inicio = time.time()
+    versao = versao_dataset(pasta)
+    df_raw = load_csv_data(pasta)
+    _, df_class, gdf_inter, _, _ = validate_data(df_raw, materializar_geometrias(df_raw, pasta, versao))
+    # mesmo município por lote que o app (junção espacial)
+    municipios = load_municipios(pasta)
+    df_class = com_municipio_espacial(
+        df_class, materializar_municipios_lotes(gdf_inter, municipios, pasta, versao), municipios
+    )
+    metricas = materializar_metricas(df_class, pasta, versao)
+
+    escopos = materializar_escopos(df_class, metricas, pasta, versao, processos)
+    print(f"{len(escopos)} escopos pré-renderizados ({time.time() - inicio:.1f}s)")